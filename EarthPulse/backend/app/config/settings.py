@@ -4,11 +4,45 @@ Environment-based configuration with placeholder API endpoints
 """
 
 import os
-from typing import List, Optional
-from pydantic import Field
-from pydantic_settings import BaseSettings
+from typing import Final, Optional, Tuple
+from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 
+# Environmental Data Configuration
+DATA_YEAR_MIN: Final[int] = 2000
+DATA_YEAR_MAX: Final[int] = 2025
+DEFAULT_REGION: Final[str] = "nepal_himalayas"
+
+# Supported Regions
+SUPPORTED_REGIONS: Final[Tuple[str, ...]] = (
+    "nepal_himalayas",
+    "kathmandu_valley",
+    "annapurna_region",
+    "everest_region"
+)
+
+# Supported Data Indicators
+SUPPORTED_INDICATORS: Final[Tuple[str, ...]] = (
+    "ndvi",
+    "glacier",
+    "urban",
+    "temperature"
+)
+
+# Processing Settings
+MAX_CONCURRENT_REQUESTS: Final[int] = 10
+TIMEOUT_SECONDS: Final[int] = 30
+RETRY_ATTEMPTS: Final[int] = 3
+
+# Size suffixes accepted by MAX_FILE_SIZE, longest first so "MB" wins over "B"
+_SIZE_UNITS: Final[Tuple[Tuple[str, int], ...]] = (
+    ("KB", 1024),
+    ("MB", 1024 ** 2),
+    ("GB", 1024 ** 3),
+    ("B", 1)
+)
+
 class Settings(BaseSettings):
     """Application configuration settings"""
     
@@ -19,6 +53,9 @@ class Settings(BaseSettings):
     APP_VERSION: str = Field(default="1.0.0", env="APP_VERSION")
     HOST: str = Field(default="0.0.0.0", env="HOST")
     PORT: int = Field(default=8000, env="PORT")
+    # Response caches, single-flight maps and report status live in each
+    # process unless Redis is reachable, so only raise this alongside Redis
+    WORKERS: int = Field(default=1, env="WORKERS")
     
     # NASA Earth Observation APIs
     NASA_API_KEY: str = Field(default="your_nasa_api_key_here", env="NASA_API_KEY")
@@ -61,7 +98,7 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = Field(default="./uploads", env="UPLOAD_DIR")
     REPORT_OUTPUT_DIR: str = Field(default="./reports", env="REPORT_OUTPUT_DIR")
     CACHE_DIR: str = Field(default="./cache", env="CACHE_DIR")
-    MAX_FILE_SIZE: str = Field(default="100MB", env="MAX_FILE_SIZE")
+    MAX_FILE_SIZE: int = Field(default="100MB", env="MAX_FILE_SIZE", validate_default=True)
     
     # Security
     SECRET_KEY: str = Field(default="your_secret_key_here_change_this_in_production", env="SECRET_KEY")
@@ -69,20 +106,20 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=60, env="ACCESS_TOKEN_EXPIRE_MINUTES")
     
     # CORS Configuration
-    ALLOWED_ORIGINS: List[str] = Field(
-        default=[
+    ALLOWED_ORIGINS: Tuple[str, ...] = Field(
+        default=(
             "http://localhost:3000",
             "http://127.0.0.1:3000",
             "http://localhost:5173",
             "http://127.0.0.1:5173"
-        ],
+        ),
         env="ALLOWED_ORIGINS"
     )
-    ALLOWED_METHODS: List[str] = Field(
-        default=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    ALLOWED_METHODS: Tuple[str, ...] = Field(
+        default=("GET", "POST", "PUT", "DELETE", "OPTIONS"),
         env="ALLOWED_METHODS"
     )
-    ALLOWED_HEADERS: List[str] = Field(default=["*"], env="ALLOWED_HEADERS")
+    ALLOWED_HEADERS: Tuple[str, ...] = Field(default=("*",), env="ALLOWED_HEADERS")
     
     # Logging
     LOG_LEVEL: str = Field(default="INFO", env="LOG_LEVEL")
@@ -93,41 +130,37 @@ class Settings(BaseSettings):
     MOCK_DATA_REGION: str = Field(default="nepal_himalayas", env="MOCK_DATA_REGION")
     SIMULATE_API_DELAY: bool = Field(default=True, env="SIMULATE_API_DELAY")
     API_DELAY_MS: int = Field(default=500, env="API_DELAY_MS")
-    
-    # Environmental Data Configuration
-    DATA_YEAR_MIN: int = 2000
-    DATA_YEAR_MAX: int = 2025
-    DEFAULT_REGION: str = "nepal_himalayas"
-    
-    # Supported Regions
-    SUPPORTED_REGIONS: List[str] = [
-        "nepal_himalayas",
-        "kathmandu_valley", 
-        "annapurna_region",
-        "everest_region"
-    ]
-    
-    # Supported Data Indicators
-    SUPPORTED_INDICATORS: List[str] = [
-        "ndvi",
-        "glacier",
-        "urban", 
-        "temperature"
-    ]
-    
-    # Processing Settings
-    MAX_CONCURRENT_REQUESTS: int = 10
-    TIMEOUT_SECONDS: int = 30
-    RETRY_ATTEMPTS: int = 3
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    RANDOM_SEED: Optional[int] = Field(default=None, env="RANDOM_SEED")  # Fixes unseeded draws, e.g. API delays
+    
+    @field_validator("MAX_FILE_SIZE", mode="before")
+    @classmethod
+    def parse_file_size(cls, value):
+        """Convert sizes like "100MB" or "1GB" to a byte count once at load time"""
+        if isinstance(value, str):
+            size = value.strip().upper()
+            for suffix, multiplier in _SIZE_UNITS:
+                if size.endswith(suffix):
+                    return int(float(size[:-len(suffix)].strip()) * multiplier)
+            return int(size)
+        return value
+    
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        frozen=True,
+        validate_assignment=False,
+        # Older .env files may still carry the constants below
+        extra="ignore"
+    )
 
-@lru_cache()
+@lru_cache(maxsize=None)
 def get_settings() -> Settings:
     """Get cached settings instance"""
     return Settings()
 
 # Global settings instance
 settings = get_settings()
+
+# Hashed views for request-time membership checks
+SUPPORTED_REGIONS_SET: Final[frozenset] = frozenset(SUPPORTED_REGIONS)
+SUPPORTED_INDICATORS_SET: Final[frozenset] = frozenset(SUPPORTED_INDICATORS)
@@ -0,0 +1,34 @@
+"""
+FastAPI Dependencies for Earth Observation Visualizer
+Expose the service singletons initialized at startup to route handlers
+"""
+
+from functools import lru_cache
+
+from fastapi import HTTPException, Query, Request
+
+from app.services.nasa_api import NASAEOClient
+from app.services.map_service import MapService
+from app.models.environmental import YearRange
+
+def get_nasa_client(request: Request) -> NASAEOClient:
+    """Get the NASA API client initialized during application startup"""
+    return request.app.state.nasa_client
+
+def get_map_service(request: Request) -> MapService:
+    """Get the map service initialized during application startup"""
+    return request.app.state.map_service
+
+@lru_cache(maxsize=512)
+def _parse_year_range(year_range: str) -> YearRange:
+    """Parse a year range string once; YearRange is frozen so results can be shared"""
+    return YearRange.model_validate(year_range)
+
+def parse_year_range(
+    year_range: str = Query(default="2000-2025", description="Year range in format 'start-end'")
+) -> YearRange:
+    """Validate the year_range query parameter"""
+    try:
+        return _parse_year_range(year_range)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid year range format. Use 'YYYY-YYYY'")
@@ -5,11 +5,14 @@ Integrates NASA Earth Observation data for environmental visualization
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from contextlib import asynccontextmanager
-import os
+import asyncio
+from datetime import datetime, timezone
+from types import MappingProxyType
 from typing import Dict, Any
 import logging
+import orjson
 
 # Import routes
 from app.routes import environmental, maps, reports
@@ -19,52 +22,122 @@ from app.config.settings import settings
 logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
+# Interactive documentation is only served in debug mode
+_DOCS_URL = "/api/docs" if settings.DEBUG else None
+_REDOC_URL = "/api/redoc" if settings.DEBUG else None
+
+# Seconds a warmup claim is held, so a restart after it expires warms again
+_WARMUP_LOCK_TTL = 300
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown events"""
     # Startup
     logger.info("🌍 Earth Observation Visualizer Backend Starting...")
-    logger.info(f"Environment: {settings.ENVIRONMENT}")
-    logger.info(f"Debug Mode: {settings.DEBUG}")
-    logger.info(f"Using Mock Data: {settings.USE_MOCK_DATA}")
+    logger.info("Environment: %s", settings.ENVIRONMENT)
+    logger.info("Debug Mode: %s", settings.DEBUG)
+    logger.info("Using Mock Data: %s", settings.USE_MOCK_DATA)
+
+    # On Python 3.12+, let tasks whose coroutine finishes without suspending
+    # (e.g. cache hits) complete immediately instead of being scheduled
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
     
     # Initialize any required services here
-    await initialize_services()
+    await initialize_services(app)
+
+    cache_service = app.state.cache_service
+    if settings.WORKERS > 1 and not cache_service.is_persistent:
+        logger.warning(
+            "Running %d workers without Redis: caches and report status are per worker",
+            settings.WORKERS,
+        )
+
+    # Fill the response cache for the default grid in the background so the
+    # first requests don't pay for a cold simulator; with a shared Redis cache
+    # only the first worker to claim the warmup runs it
+    warmup_task = None
+    if await cache_service.claim("warmup:lock", _WARMUP_LOCK_TTL):
+        warmup_task = asyncio.create_task(environmental.warm_cache())
     
     yield
     
     # Shutdown
     logger.info("🌍 Earth Observation Visualizer Backend Shutting Down...")
+    if warmup_task is not None:
+        warmup_task.cancel()
+    await asyncio.gather(
+        app.state.nasa_client.close(),
+        app.state.map_service.close(),
+        app.state.cache_service.close(),
+        maps.close_gibs_client(),
+        return_exceptions=True
+    )
 
-async def initialize_services():
+async def initialize_services(app: FastAPI):
     """Initialize external services and connections"""
+    # Service modules are only needed once startup runs, so import them here.
+    # The module-level singletons are initialized so every consumer shares
+    # one warm client instead of constructing its own.
+    from app.services.nasa_api import nasa_client
+    from app.services.map_service import map_service
+    from app.services.cache import cache_service
+
+    app.state.nasa_client = nasa_client
+    app.state.map_service = map_service
+    app.state.cache_service = cache_service
+
+    # Pooled client for the GIBS imagery proxy
+    await maps.open_gibs_client()
+
+    # Render the common placeholder sizes off the event loop
     try:
-        # Initialize NASA API connections
-        from app.services.nasa_api import NASAEOClient
-        nasa_client = NASAEOClient()
-        await nasa_client.initialize()
-        logger.info("✅ NASA API Client initialized")
-        
-        # Initialize map services
-        from app.services.map_service import MapService
-        map_service = MapService()
-        await map_service.initialize()
-        logger.info("✅ Map Service initialized")
-        
-        logger.info("🚀 All services initialized successfully")
+        await asyncio.to_thread(maps.warm_placeholders)
     except Exception as e:
-        logger.error(f"❌ Error initializing services: {e}")
-        # Don't raise the error, just log it and continue
-        # The app can still work with mock data
+        logger.warning("Placeholder pre-render skipped: %s", e)
+
+    try:
+        # Initialize NASA API connections, map services and the cache concurrently
+        services = (
+            ("NASA API Client", nasa_client),
+            ("Map Service", map_service),
+            ("Response Cache", cache_service),
+        )
+        results = await asyncio.gather(
+            *(service.initialize() for _, service in services),
+            return_exceptions=True
+        )
+
+        failed = False
+        for (name, _), result in zip(services, results):
+            if isinstance(result, BaseException):
+                failed = True
+                logger.error("❌ Error initializing %s: %s", name, result)
+            else:
+                logger.info("✅ %s initialized", name)
+
+        if failed:
+            # Don't raise the error, just log it and continue
+            # The app can still work with mock data
+            logger.info("🔄 Continuing with mock data mode")
+        else:
+            logger.info("🚀 All services initialized successfully")
+    except Exception as e:
+        logger.error("❌ Error initializing services: %s", e)
         logger.info("🔄 Continuing with mock data mode")
 
+    # Build the OpenAPI schema now so the first docs request doesn't pay for it;
+    # FastAPI caches the result on app.openapi_schema
+    app.openapi()
+
 # Create FastAPI application
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description="Interactive Earth Observation Visualizer using NASA satellite data for environmental change analysis",
-    docs_url="/api/docs" if settings.DEBUG else None,
-    redoc_url="/api/redoc" if settings.DEBUG else None,
+    docs_url=_DOCS_URL,
+    redoc_url=_REDOC_URL,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -82,65 +155,74 @@ app.include_router(environmental.router, prefix="/api/v1/environmental", tags=["
 app.include_router(maps.router, prefix="/api/v1/maps", tags=["Map Services"])
 app.include_router(reports.router, prefix="/api/v1/reports", tags=["Reports & Export"])
 
+# Static endpoint payloads, built once from settings at import time
+_ROOT_RESPONSE = {
+    "name": settings.APP_NAME,
+    "version": settings.APP_VERSION,
+    "status": "operational",
+    "environment": settings.ENVIRONMENT,
+    "data_source": "Mock Data (NASA EO Simulation)" if settings.USE_MOCK_DATA else "NASA Earth Observation APIs",
+    "endpoints": {
+        "docs": _DOCS_URL or "Documentation disabled in production",
+        "environmental": "/api/v1/environmental",
+        "maps": "/api/v1/maps",
+        "reports": "/api/v1/reports"
+    }
+}
+
+_HEALTH_BASE = MappingProxyType({
+    "status": "healthy",
+    "services": {
+        "nasa_api": "operational",
+        "map_service": "operational",
+        "database": "operational" if not settings.USE_MOCK_DATA else "mock",
+        "redis_cache": "operational" if not settings.USE_MOCK_DATA else "mock"
+    }
+})
+
+_INFO_RESPONSE = {
+    "api_version": "v1",
+    "capabilities": [
+        "Environmental indicator tracking (NDVI, Glaciers, Urban, Temperature)",
+        "Temporal data analysis (2000-2025)",
+        "Regional comparison tools",
+        "Map tile generation",
+        "Report generation and export",
+        "Real-time data simulation"
+    ],
+    "data_indicators": {
+        "ndvi": "Normalized Difference Vegetation Index (MODIS)",
+        "glacier": "Glacier coverage and retreat analysis",
+        "urban": "Urban expansion using nightlight data",
+        "temperature": "Land surface temperature (LST)"
+    },
+    "geographic_coverage": [
+        "Nepal Himalayas",
+        "Kathmandu Valley",
+        "Annapurna Region",
+        "Everest Region"
+    ],
+    "integration_ready": True,
+    "real_api_endpoint": "Ready for NASA Earth Observation API integration"
+}
+
+_ROOT_BYTES = orjson.dumps(_ROOT_RESPONSE)
+_INFO_BYTES = orjson.dumps(_INFO_RESPONSE)
+
 @app.get("/")
 async def root():
     """Root endpoint with application information"""
-    return {
-        "name": settings.APP_NAME,
-        "version": settings.APP_VERSION,
-        "status": "operational",
-        "environment": settings.ENVIRONMENT,
-        "data_source": "Mock Data (NASA EO Simulation)" if settings.USE_MOCK_DATA else "NASA Earth Observation APIs",
-        "endpoints": {
-            "docs": "/api/docs" if settings.DEBUG else "Documentation disabled in production",
-            "environmental": "/api/v1/environmental",
-            "maps": "/api/v1/maps",
-            "reports": "/api/v1/reports"
-        }
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring"""
-    return {
-        "status": "healthy",
-        "timestamp": "2024-01-01T01:01:01Z",
-        "services": {
-            "nasa_api": "operational",
-            "map_service": "operational",
-            "database": "operational" if not settings.USE_MOCK_DATA else "mock",
-            "redis_cache": "operational" if not settings.USE_MOCK_DATA else "mock"
-        }
-    }
+    return {**_HEALTH_BASE, "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")}
 
 @app.get("/api/v1/info")
 async def api_info():
     """API information and capabilities"""
-    return {
-        "api_version": "v1",
-        "capabilities": [
-            "Environmental indicator tracking (NDVI, Glaciers, Urban, Temperature)",
-            "Temporal data analysis (2000-2025)",
-            "Regional comparison tools",
-            "Map tile generation",
-            "Report generation and export",
-            "Real-time data simulation"
-        ],
-        "data_indicators": {
-            "ndvi": "Normalized Difference Vegetation Index (MODIS)",
-            "glacier": "Glacier coverage and retreat analysis",
-            "urban": "Urban expansion using nightlight data",
-            "temperature": "Land surface temperature (LST)"
-        },
-        "geographic_coverage": [
-            "Nepal Himalayas",
-            "Kathmandu Valley",
-            "Annapurna Region",
-            "Everest Region"
-        ],
-        "integration_ready": True,
-        "real_api_endpoint": "Ready for NASA Earth Observation API integration"
-    }
+    return Response(content=_INFO_BYTES, media_type="application/json")
 
 @app.get("/api/v1/environmental/summary")
 async def environmental_summary():
@@ -154,7 +236,7 @@ async def environmental_summary():
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler for unhandled errors"""
-    logger.error(f"Unhandled error: {exc}")
+    logger.error("Unhandled error: %s", exc)
     return JSONResponse(
         status_code=500,
         content={
@@ -164,12 +246,39 @@ async def global_exception_handler(request, exc):
         }
     )
 
+def _worker_count() -> int:
+    """Worker processes to start: WORKERS only when Redis answers, else one
+
+    Caches and report status live in each process without Redis, so several
+    workers would each see a different subset of them
+    """
+    if settings.DEBUG or settings.USE_MOCK_DATA or settings.WORKERS <= 1:
+        return 1
+    try:
+        import redis
+
+        redis.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=1).ping()
+    except Exception as e:
+        logger.warning("Redis unavailable (%s), starting a single worker", e)
+        return 1
+    return settings.WORKERS
+
 if __name__ == "__main__":
     import uvicorn
+    # uvloop and httptools ship with uvicorn[standard]; uvloop isn't available
+    # on Windows, where the default asyncio loop is used instead
+    try:
+        import uvloop
+        loop = "uvloop"
+    except ImportError:
+        loop = "auto"
     uvicorn.run(
         "main:app",
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
+        workers=None if settings.DEBUG else _worker_count(),
+        loop=loop,
+        http="httptools",
         log_level=settings.LOG_LEVEL.lower()
     )
@@ -3,11 +3,15 @@ Environmental Data Models for Earth Observation Visualizer
 Based on NASA Earth Observation datasets
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any, Union
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import List, Optional, Dict, Any, Tuple, Union
 from datetime import datetime
-from enum import Enum
+from enum import Enum, unique
 
+from app.models.geographic import BoundingBox, Coordinate
+from app.utils._fastpath import split_year_range
+
+@unique
 class DataIndicator(str, Enum):
     """Environmental data indicators"""
     NDVI = "ndvi"
@@ -15,6 +19,7 @@ class DataIndicator(str, Enum):
     URBAN = "urban"
     TEMPERATURE = "temperature"
 
+@unique
 class Region(str, Enum):
     """Supported geographic regions"""
     NEPAL_HIMALAYAS = "nepal_himalayas"
@@ -22,6 +27,7 @@ class Region(str, Enum):
     ANNAPURNA_REGION = "annapurna_region"
     EVEREST_REGION = "everest_region"
 
+@unique
 class DataSource(str, Enum):
     """Environmental data sources"""
     MODIS = "modis"
@@ -31,56 +37,84 @@ class DataSource(str, Enum):
 
 class EnvironmentalDataPoint(BaseModel):
     """Single environmental data point"""
+    model_config = ConfigDict(frozen=True)
+
     longitude: float = Field(..., description="Longitude coordinate")
     latitude: float = Field(..., description="Latitude coordinate")
     value: float = Field(..., description="Environmental measurement value")
     confidence: Optional[float] = Field(None, description="Data confidence level (0-1)")
     timestamp: datetime = Field(..., description="Measurement timestamp")
+
+    @classmethod
+    def fast_from_row(
+        cls,
+        longitude: float,
+        latitude: float,
+        value: float,
+        timestamp: datetime,
+        confidence: Optional[float] = None
+    ) -> "EnvironmentalDataPoint":
+        """Build a data point from trusted internal values, skipping validation"""
+        return cls.model_construct(
+            longitude=longitude,
+            latitude=latitude,
+            value=value,
+            confidence=confidence,
+            timestamp=timestamp
+        )
     
 class NDVIData(BaseModel):
     """NDVI (Normalized Difference Vegetation Index) data"""
+    model_config = ConfigDict(frozen=True)
+
     year: int = Field(..., ge=2000, le=2025, description="Year of measurement")
     region: Region = Field(..., description="Geographic region")
     average_ndvi: float = Field(..., ge=-1, le=1, description="Average NDVI value")
     min_ndvi: float = Field(..., ge=-1, le=1, description="Minimum NDVI value")
     max_ndvi: float = Field(..., ge=-1, le=1, description="Maximum NDVI value")
     vegetation_coverage_percent: float = Field(..., ge=0, le=100, description="Vegetation coverage percentage")
-    data_points: List[EnvironmentalDataPoint] = Field(default_factory=list)
+    data_points: Tuple[EnvironmentalDataPoint, ...] = Field(default_factory=tuple)
     source: DataSource = Field(default=DataSource.MODIS, description="Data source")
     trend: Optional[str] = Field(None, description="Trend direction: increasing/decreasing/stable")
 
 class GlacierData(BaseModel):
     """Glacier coverage and retreat data"""
+    model_config = ConfigDict(frozen=True)
+
     year: int = Field(..., ge=2000, le=2025, description="Year of measurement")
     region: Region = Field(..., description="Geographic region")
     glacier_area_km2: float = Field(..., ge=0, description="Glacier area in square kilometers")
     ice_thickness_m: Optional[float] = Field(None, description="Average ice thickness in meters")
     retreat_rate_m_per_year: Optional[float] = Field(None, description="Annual retreat rate")
-    data_points: List[EnvironmentalDataPoint] = Field(default_factory=list)
+    data_points: Tuple[EnvironmentalDataPoint, ...] = Field(default_factory=tuple)
     source: DataSource = Field(default=DataSource.SENTINEL, description="Data source")
     trend: Optional[str] = Field(None, description="Trend direction: increasing/decreasing/ stable")
 
 class UrbanData(BaseModel):
     """Urban expansion data"""
+    model_config = ConfigDict(frozen=True)
+
     year: int = Field(..., ge=2000, le=2025, description="Year of measurement")
     region: Region = Field(..., description="Geographic region")
     urban_area_km2: float = Field(..., ge=0, description="Urban area in square kilometers")
     built_up_percentage: float = Field(..., ge=0, le=100, description="Built-up area percentage")
     population_estimate: Optional[int] = Field(None, description="Estimated population")
     nightlight_intensity: Optional[float] = Field(None, description="Average nightlight intensity")
-    data_points: List[EnvironmentalDataPoint] = Field(default_factory=list)
+    data_points: Tuple[EnvironmentalDataPoint, ...] = Field(default_factory=tuple)
     source: DataSource = Field(default=DataSource.LANDSAT, description="Data source")
     trend: Optional[str] = Field(None, description="Trend direction: expanding/contracting/stable")
 
 class TemperatureData(BaseModel):
     """Land surface temperature data"""
+    model_config = ConfigDict(frozen=True)
+
     year: int = Field(..., ge=2000, le=2025, description="Year of measurement")
     region: Region = Field(..., description="Geographic region")
     average_temperature_c: float = Field(..., description="Average temperature in Celsius")
     min_temperature_c: float = Field(..., description="Minimum temperature in Celsius")
     max_temperature_c: float = Field(..., description="Maximum temperature in Celsius")
     heat_island_effect: Optional[float] = Field(None, description="Urban heat island intensity")
-    data_points: List[EnvironmentalDataPoint] = Field(default_factory=list)
+    data_points: Tuple[EnvironmentalDataPoint, ...] = Field(default_factory=tuple)
     source: DataSource = Field(default=DataSource.MODIS, description="Data source")
     trend: Optional[str] = Field(None, description="Trend direction: warming/cooling/stable")
 
@@ -95,12 +129,35 @@ class TemporalComparison(BaseModel):
     trend_direction: str = Field(..., description="Direction of change")
     confidence_level: float = Field(..., ge=0, le=1, description="Statistical confidence")
     
+class YearRange(BaseModel):
+    """Inclusive year range parsed from a 'start-end' string"""
+    model_config = ConfigDict(frozen=True)
+
+    start: int = Field(..., ge=2000, le=2025, description="First year of the range")
+    end: int = Field(..., ge=2000, le=2025, description="Last year of the range")
+
+    @model_validator(mode="before")
+    @classmethod
+    def parse_range_string(cls, data: Any) -> Any:
+        """Accept the 'YYYY-YYYY' query string form"""
+        if isinstance(data, str):
+            start, end = split_year_range(data)
+            return {"start": start, "end": end}
+        return data
+
+    @model_validator(mode="after")
+    def check_order(self) -> "YearRange":
+        """Ensure the range is not reversed"""
+        if self.start > self.end:
+            raise ValueError("start year must not be after end year")
+        return self
+    
 class RegionalBoundary(BaseModel):
     """Regional boundary coordinates"""
     region: Region = Field(..., description="Region identifier")
     coordinates: List[List[float]] = Field(..., description="Boundary coordinates [[lng,lat], ...]")
-    bounding_box: Dict[str, float] = Field(..., description="Bounding box: {min_lng, min_lat, max_lng, max_lat}")
-    center: Dict[str, float] = Field(..., description="Region center: {lng, lat}")
+    bounding_box: BoundingBox = Field(..., description="Region bounding box")
+    center: Coordinate = Field(..., description="Region center")
     
 class EnvironmentalSummary(BaseModel):
     """Summary environmental data for a region and year"""
@@ -133,3 +190,9 @@ class DataValidation(BaseModel):
     temporal_resolution: str = Field(..., description="Temporal resolution of data")
     last_updated: datetime = Field(..., description="Last data update timestamp")
     data_gaps: List[str] = Field(default_factory=list, description="Identified data gaps")
+
+# Plain string values for hot paths that build many records
+NDVI_STR = DataIndicator.NDVI.value
+GLACIER_STR = DataIndicator.GLACIER.value
+URBAN_STR = DataIndicator.URBAN.value
+TEMPERATURE_STR = DataIndicator.TEMPERATURE.value
@@ -3,17 +3,23 @@ Geographic Models for Earth Observation Visualizer
 Regional boundaries, coordinates, and spatial data structures
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
+from types import MappingProxyType
+from typing import Final, List, Dict, Mapping, Optional, Tuple
 from enum import Enum
+import numpy as np
 
 class Coordinate(BaseModel):
     """Single coordinate point"""
+    model_config = ConfigDict(frozen=True)
+
     longitude: float = Field(..., ge=-180, le=180, description="Longitude coordinate")
     latitude: float = Field(..., ge=-90, le=90, description="Latitude coordinate")
 
 class BoundingBox(BaseModel):
     """Bounding box for geographic areas"""
+    model_config = ConfigDict(frozen=True)
+
     min_longitude: float = Field(..., ge=-180, le=180, description="Minimum longitude")
     min_latitude: float = Field(..., ge=-90, le=90, description="Minimum latitude")
     max_longitude: float = Field(..., ge=-180, le=180, description="Maximum longitude")
@@ -44,6 +50,8 @@ class MapTile(BaseModel):
 
 class RegionInfo(BaseModel):
     """Detailed region information"""
+    model_config = ConfigDict(frozen=True)
+
     region_id: str = Field(..., description="Unique region identifier")
     name: str = Field(..., description="Region display name")
     coordinates: List[Coordinate] = Field(..., description="Region boundary coordinates")
@@ -53,8 +61,27 @@ class RegionInfo(BaseModel):
     population: Optional[int] = Field(None, description="Current population estimate")
     climate_zone: Optional[str] = Field(None, description="Climate classification")
 
+    # Boundary as a contiguous (N, 2) float64 array of [lng, lat] for vectorized spatial ops
+    _coordinates_array: np.ndarray = PrivateAttr()
+
+    @model_validator(mode="after")
+    def _build_coordinates_array(self) -> "RegionInfo":
+        """Mirror the boundary coordinates into a read-only NumPy array"""
+        array = np.array(
+            [(coord.longitude, coord.latitude) for coord in self.coordinates],
+            dtype=np.float64
+        ).reshape(-1, 2)
+        array.flags.writeable = False
+        self._coordinates_array = array
+        return self
+
+    @property
+    def coordinates_array(self) -> np.ndarray:
+        """Boundary coordinates as an (N, 2) float64 array of [lng, lat]"""
+        return self._coordinates_array
+
 # Predefined Nepal regions with actual coordinates
-NEPAL_REGIONS = {
+NEPAL_REGIONS: Final[Mapping[str, RegionInfo]] = MappingProxyType({
     "kathmandu_valley": RegionInfo(
         region_id="kathmandu_valley",
         name="Kathmandu Valley",
@@ -142,22 +169,34 @@ NEPAL_REGIONS = {
         population=30000000,
         climate_zone="Diverse Alpine to Subtropical"
     )
+})
+
+# Region centers and boundaries never change, so resolve them once at import
+_REGION_CENTERS: Dict[str, Tuple[float, float]] = {
+    region_id: region.bounding_box.get_center()
+    for region_id, region in NEPAL_REGIONS.items()
+}
+
+_REGION_BOUNDARIES: Dict[str, Tuple[Tuple[float, float], ...]] = {
+    region_id: tuple((coord.longitude, coord.latitude) for coord in region.coordinates)
+    for region_id, region in NEPAL_REGIONS.items()
 }
 
 def get_region_info(region_id: str) -> Optional[RegionInfo]:
     """Get region information by ID"""
     return NEPAL_REGIONS.get(region_id)
 
-def get_region_boundary(region_id: str) -> Optional[List[Tuple[float, float]]]:
+def get_region_boundary(region_id: str) -> Optional[Tuple[Tuple[float, float], ...]]:
     """Get region boundary coordinates as tuples"""
-    region = get_region_info(region_id)
+    return _REGION_BOUNDARIES.get(region_id)
+
+def get_region_boundary_array(region_id: str) -> Optional[np.ndarray]:
+    """Get region boundary coordinates as an (N, 2) float64 array of [lng, lat]"""
+    region = NEPAL_REGIONS.get(region_id)
     if region:
-        return [(coord.longitude, coord.latitude) for coord in region.coordinates]
+        return region.coordinates_array
     return None
 
 def get_region_center(region_id: str) -> Optional[Tuple[float, float]]:
     """Get region center coordinates"""
-    region = get_region_info(region_id)
-    if region:
-        return region.bounding_box.get_center()
-    return None
+    return _REGION_CENTERS.get(region_id)
@@ -3,22 +3,132 @@ Environmental Data API Routes
 Provides endpoints for NDVI, Glacier, Urban, and Temperature data
 """
 
-from fastapi import APIRouter, HTTPException, Query, Path
-from typing import List, Optional, Union
+import asyncio
+import logging
+from functools import lru_cache
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request
+from fastapi.responses import ORJSONResponse
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime
 
 from app.models.environmental import (
     NDVIData, GlacierData, UrbanData, TemperatureData,
-    DataIndicator, Region, EnvironmentalSummary, ComparisonResult
+    DataIndicator, Region, EnvironmentalSummary, ComparisonResult, YearRange
 )
+from app.dependencies import parse_year_range
+from app.utils._fastpath import comparison_metrics, sample_years
 from app.services.data_simulation import environmental_simulator
-from app.config.settings import settings
+from app.services.cache import cached, conditional_json, static_headers
+from app.config.settings import DATA_YEAR_MIN, DATA_YEAR_MAX, MAX_CONCURRENT_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Bound on simulator calls in flight across all requests
+_SIMULATOR_SEM = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+async def _bounded(coro):
+    """Await a simulator coroutine under the shared concurrency limit"""
+    async with _SIMULATOR_SEM:
+        return await coro
+
+# Simulator calls currently running, keyed by (indicator, region, year)
+_INFLIGHT: Dict[Tuple[str, str, int], asyncio.Task] = {}
+
+async def _single_flight(key: Tuple[str, str, int], coro_factory):
+    """Share one running call between concurrent requests for the same key"""
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(coro_factory())
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+    # Shield so one client disconnecting doesn't cancel the others' result
+    return await asyncio.shield(task)
 
-router = APIRouter()
+# Indicator -> (simulator coroutine, headline value attribute, unit)
+_SIMULATOR_DISPATCH = {
+    DataIndicator.NDVI: (environmental_simulator.simulate_ndvi_data, "average_ndvi", "NDVI"),
+    DataIndicator.GLACIER: (environmental_simulator.simulate_glacier_data, "glacier_area_km2", "km²"),
+    DataIndicator.URBAN: (environmental_simulator.simulate_urban_data, "urban_area_km2", "km²"),
+    DataIndicator.TEMPERATURE: (environmental_simulator.simulate_temperature_data, "average_temperature_c", "°C"),
+}
+
+async def _simulate(indicator: DataIndicator, region: Region, year: int):
+    """Run one deduplicated, concurrency-bounded simulator call"""
+    simulate = _SIMULATOR_DISPATCH[indicator][0]
+    return await _single_flight(
+        (indicator.value, region.value, year),
+        lambda: _bounded(simulate(region, year))
+    )
+
+
+# Static indicator catalogue, built once at import time
+_INDICATORS_RESPONSE = {
+    "indicators": [
+        {
+            "id": "ndvi",
+            "name": "Normalized Difference Vegetation Index",
+            "description": "Plant health and vegetation density",
+            "unit": "NDVI",
+            "source": "MODIS/Landsat",
+            "range": "0.0 to 1.0"
+        },
+        {
+            "id": "glacier",
+            "name": "Glacier Coverage",
+            "description": "Glacier extent and ice coverage",
+            "unit": "km²",
+            "source": "Sentinel/Landsat",
+            "range": "Variable"
+        },
+        {
+            "id": "urban",
+            "name": "Urban Expansion",
+            "description": "Built-up area and urban development",
+            "unit": "km²",
+            "source": "Landsat/Nightlight",
+            "range": "Variable"
+        },
+        {
+            "id": "temperature",
+            "name": "Land Surface Temperature",
+            "description": "Surface temperature monitoring",
+            "unit": "°C",
+            "source": "MODIS",
+            "range": "Variable"
+        }
+    ],
+    "regions": [
+        {
+            "id": "nepal_himalayas",
+            "name": "Nepal Himalayas",
+            "description": "Entire Nepal Himalayan region"
+        },
+        {
+            "id": "kathmandu_valley",
+            "name": "Kathmandu Valley",
+            "description": "Urban valley region"
+        },
+        {
+            "id": "annapurna_region",
+            "name": "Annapurna Region",
+            "description": "Mountain region with glaciers"
+        },
+        {
+            "id": "everest_region",
+            "name": "Everest Region",
+            "description": "High altitude extreme environment"
+        }
+    ]
+}
 
 @router.get("/ndvi/{year}", response_model=NDVIData)
+@cached(expire=3600)
 async def get_ndvi_data(
-    year: int = Path(..., ge=settings.DATA_YEAR_MIN, le=settings.DATA_YEAR_MAX),
+    year: int = Path(..., ge=DATA_YEAR_MIN, le=DATA_YEAR_MAX),
     region: Region = Query(default=Region.NEPAL_HIMALAYAS, description="Geographic region")
 ):
     """
@@ -29,11 +139,12 @@ async def get_ndvi_data(
     """
     # Always delegate to simulator which will use real NASA data when configured,
     # and gracefully fallback to simulated data otherwise.
-    return await environmental_simulator.simulate_ndvi_data(region, year)
+    return await _simulate(DataIndicator.NDVI, region, year)
 
 @router.get("/glacier/{year}", response_model=GlacierData)
+@cached(expire=3600)
 async def get_glacier_data(
-    year: int = Path(..., ge=settings.DATA_YEAR_MIN, le=settings.DATA_YEAR_MAX),
+    year: int = Path(..., ge=DATA_YEAR_MIN, le=DATA_YEAR_MAX),
     region: Region = Query(default=Region.NEPAL_HIMALAYAS, description="Geographic region")
 ):
     """
@@ -42,11 +153,12 @@ async def get_glacier_data(
     - **year**: Year between 2000-2025
     - **region**: Geographic region (nepal_himalayas, kathmandu_valley, annapurna_region, everest_region)
     """
-    return await environmental_simulator.simulate_glacier_data(region, year)
+    return await _simulate(DataIndicator.GLACIER, region, year)
 
 @router.get("/urban/{year}", response_model=UrbanData)
+@cached(expire=3600)
 async def get_urban_data(
-    year: int = Path(..., ge=settings.DATA_YEAR_MIN, le=settings.DATA_YEAR_MAX),
+    year: int = Path(..., ge=DATA_YEAR_MIN, le=DATA_YEAR_MAX),
     region: Region = Query(default=Region.NEPAL_HIMALAYAS, description="Geographic region")
 ):
     """
@@ -55,11 +167,12 @@ async def get_urban_data(
     - **year**: Year between 2000-2025
     - **region**: Geographic region (nepal_himalayas, kathmandu_valley, annapurna_region, everest_region)
     """
-    return await environmental_simulator.simulate_urban_data(region, year)
+    return await _simulate(DataIndicator.URBAN, region, year)
 
 @router.get("/temperature/{year}", response_model=TemperatureData)
+@cached(expire=3600)
 async def get_temperature_data(
-    year: int = Path(..., ge=settings.DATA_YEAR_MIN, le=settings.DATA_YEAR_MAX),
+    year: int = Path(..., ge=DATA_YEAR_MIN, le=DATA_YEAR_MAX),
     region: Region = Query(default=Region.NEPAL_HIMALAYAS, description="Geographic region")
 ):
     """
@@ -68,11 +181,12 @@ async def get_temperature_data(
     - **year**: Year between 2000-2025
     - **region**: Geographic region (nepal_himalayas, kathmandu_valley, annapurna_region, everest_region)
     """
-    return await environmental_simulator.simulate_temperature_data(region, year)
+    return await _simulate(DataIndicator.TEMPERATURE, region, year)
 
 @router.get("/summary", response_model=EnvironmentalSummary)
+@cached(expire=3600)
 async def get_environmental_summary(
-    year: int = Query(..., ge=settings.DATA_YEAR_MIN, le=settings.DATA_YEAR_MAX),
+    year: int = Query(..., ge=DATA_YEAR_MIN, le=DATA_YEAR_MAX),
     region: Region = Query(default=Region.NEPAL_HIMALAYAS, description="Geographic region")
 ):
     """
@@ -82,33 +196,33 @@ async def get_environmental_summary(
     - **region**: Geographic region (nepal_himalayas, kathmandu_valley, annapurna_region, everest_region)
     """
     # Generate all environmental data concurrently (real or simulated handled in service)
-    import asyncio
-    
-    ndvi_task = environmental_simulator.simulate_ndvi_data(region, year)
-    glacier_task = environmental_simulator.simulate_glacier_data(region, year)
-    urban_task = environmental_simulator.simulate_urban_data(region, year)
-    temperature_task = environmental_simulator.simulate_temperature_data(region, year)
-    
-    ndvi_data, glacier_data, urban_data, temperature_data = await asyncio.gather(
-        ndvi_task, glacier_task, urban_task, temperature_task
-    )
+    async with asyncio.TaskGroup() as tg:
+        ndvi_task = tg.create_task(_simulate(DataIndicator.NDVI, region, year))
+        glacier_task = tg.create_task(_simulate(DataIndicator.GLACIER, region, year))
+        urban_task = tg.create_task(_simulate(DataIndicator.URBAN, region, year))
+        temperature_task = tg.create_task(_simulate(DataIndicator.TEMPERATURE, region, year))
     
     return EnvironmentalSummary(
         year=year,
         region=region,
-        ndvi_data=ndvi_data,
-        glacier_data=glacier_data,
-        urban_data=urban_data,
-        temperature_data=temperature_data
+        ndvi_data=ndvi_task.result(),
+        glacier_data=glacier_task.result(),
+        urban_data=urban_task.result(),
+        temperature_data=temperature_task.result()
     )
 
 @router.get("/compare/temporal", response_model=List[ComparisonResult])
+@cached(expire=3600)
 async def get_temporal_comparison(
     indicator: DataIndicator = Query(..., description="Environmental indicator to compare"),
     region: Region = Query(default=Region.NEPAL_HIMALAYAS, description="Geographic region"),
-    start_year: int = Query(default=2000, ge=settings.DATA_YEAR_MIN, le=settings.DATA_YEAR_MAX),
-    end_year: int = Query(default=2025, ge=settings.DATA_YEAR_MIN, le=settings.DATA_YEAR_MAX),
-    include_intermediate: bool = Query(default=False, description="Include data for years between start and end")
+    start_year: int = Query(default=2000, ge=DATA_YEAR_MIN, le=DATA_YEAR_MAX),
+    end_year: int = Query(default=2025, ge=DATA_YEAR_MIN, le=DATA_YEAR_MAX),
+    include_intermediate: bool = Query(
+        default=False,
+        description="Ignored; the comparison only uses the start and end years",
+        deprecated=True
+    )
 ):
     """
     Compare environmental data across different years
@@ -117,55 +231,22 @@ async def get_temporal_comparison(
     - **region**: Geographic region (nepal_himalayas, kathmandu_valley, annapurna_region, everest_region)
     - **start_year**: Starting year for comparison (2000-2025)
     - **end_year**: Ending year for comparison (2000-2025)
-    - **include_intermediate**: Include data for in-between years
+    - **include_intermediate**: Deprecated and ignored; only the start and end years are compared
     """
     if start_year >= end_year:
         raise HTTPException(status_code=400, detail="start_year must be less than end_year")
     
-    results = []
-    years_to_analyze = [start_year, end_year]
-    
-    if include_intermediate:
-        # Include every 5 years in between
-        intermediate_years = list(range(start_year + 5, end_year, 5))
-        years_to_analyze = sorted([start_year] + intermediate_years + [end_year])
-    
-    # Get data for comparison years
-    import asyncio
-    
-    async def get_indicator_data(year: int):
-        if indicator == DataIndicator.NDVI:
-            return await environmental_simulator.simulate_ndvi_data(region, year)
-        elif indicator == DataIndicator.GLACIER:
-            return await environmental_simulator.simulate_glacier_data(region, year)
-        elif indicator == DataIndicator.URBAN:
-            return await environmental_simulator.simulate_urban_data(region, year)
-        elif indicator == DataIndicator.TEMPERATURE:
-            return await environmental_simulator.simulate_temperature_data(region, year)
-    
-    data_tasks = [get_indicator_data(y) for y in years_to_analyze]
-    data_results = await asyncio.gather(*data_tasks)
-    
-    # Calculate comparison metrics
-    baseline_data = data_results[0]
-    comparison_data = data_results[-1]
-    
-    # Extract baseline values based on indicator type
-    if indicator == DataIndicator.NDVI:
-        baseline_value = baseline_data.average_ndvi
-        comparison_value = comparison_data.average_ndvi
-    elif indicator == DataIndicator.GLACIER:
-        baseline_value = baseline_data.glacier_area_km2
-        comparison_value = comparison_data.glacier_area_km2
-    elif indicator == DataIndicator.URBAN:
-        baseline_value = baseline_data.urban_area_km2
-        comparison_value = comparison_data.urban_area_km2
-    elif indicator == DataIndicator.TEMPERATURE:
-        baseline_value = baseline_data.average_temperature_c
-        comparison_value = comparison_data.average_temperature_c
+    # Only the two endpoint years feed the comparison; intermediate years
+    # never reach the response, so they are not fetched
+    value_attr = _SIMULATOR_DISPATCH[indicator][1]
+    async with asyncio.TaskGroup() as tg:
+        baseline_task = tg.create_task(_simulate(indicator, region, start_year))
+        comparison_task = tg.create_task(_simulate(indicator, region, end_year))
+    baseline_data, comparison_data = baseline_task.result(), comparison_task.result()
     
-    change_amount = comparison_value - baseline_value
-    change_percentage = (change_amount / baseline_value * 100) if baseline_value != 0 else 0
+    baseline_value, comparison_value, change_amount, change_percentage = comparison_metrics(
+        getattr(baseline_data, value_attr), getattr(comparison_data, value_attr)
+    )
     
     trend_summary = environmental_simulator.get_trend_summary(indicator, region, start_year, end_year)
     
@@ -175,83 +256,35 @@ async def get_temporal_comparison(
         indicator=indicator,
         baseline_year=start_year,
         comparison_year=end_year,
-        baseline_value=round(baseline_value, 3),
-        comparison_value=round(comparison_value, 3),
-        change_amount=round(change_amount, 3),
-        change_percentage=round(change_percentage, 2),
+        baseline_value=baseline_value,
+        comparison_value=comparison_value,
+        change_amount=change_amount,
+        change_percentage=change_percentage,
         trend_summary=trend_summary,
         impact_assessment=f"The {indicator.value} indicator shows significant change over {end_year - start_year} years"
     )
     
     return [result]
 
+_INDICATORS_BYTES = orjson.dumps(_INDICATORS_RESPONSE)
+_INDICATORS_HEADERS = static_headers(_INDICATORS_BYTES)
+
 @router.get("/indicators")
-async def get_supported_indicators():
+async def get_supported_indicators(request: Request):
     """Get list of supported environmental indicators"""
-    return {
-        "indicators": [
-            {
-                "id": "ndvi",
-                "name": "Normalized Difference Vegetation Index",
-                "description": "Plant health and vegetation density",
-                "unit": "NDVI",
-                "source": "MODIS/Landsat",
-                "range": "0.0 to 1.0"
-            },
-            {
-                "id": "glacier",
-                "name": "Glacier Coverage",
-                "description": "Glacier extent and ice coverage",
-                "unit": "km²",
-                "source": "Sentinel/Landsat",
-                "range": "Variable"
-            },
-            {
-                "id": "urban",
-                "name": "Urban Expansion",
-                "description": "Built-up area and urban development",
-                "unit": "km²",
-                "source": "Landsat/Nightlight",
-                "range": "Variable"
-            },
-            {
-                "id": "temperature",
-                "name": "Land Surface Temperature",
-                "description": "Surface temperature monitoring",
-                "unit": "°C",
-                "source": "MODIS",
-                "range": "Variable"
-            }
-        ],
-        "regions": [
-            {
-                "id": "nepal_himalayas",
-                "name": "Nepal Himalayas",
-                "description": "Entire Nepal Himalayan region"
-            },
-            {
-                "id": "kathmandu_valley",
-                "name": "Kathmandu Valley",
-                "description": "Urban valley region"
-            },
-            {
-                "id": "annapurna_region",
-                "name": "Annapurna Region",
-                "description": "Mountain region with glaciers"
-            },
-            {
-                "id": "everest_region",
-                "name": "Everest Region",
-                "description": "High altitude extreme environment"
-            }
-        ]
-    }
+    return conditional_json(request, _INDICATORS_BYTES, _INDICATORS_HEADERS)
+
+@lru_cache(maxsize=None)
+def _years_for(start_year: int, end_year: int) -> Tuple[int, ...]:
+    """Sample every 5th year of a range, always ending on the last year"""
+    return sample_years(start_year, end_year)
 
 @router.get("/trends/{indicator}", response_model=List[dict])
+@cached(expire=3600)
 async def get_indicator_trends(
     indicator: DataIndicator = Path(..., description="Environmental indicator"),
     region: Region = Query(default=Region.NEPAL_HIMALAYAS, description="Geographic region"),
-    year_range: str = Query(default="2000-2025", description="Year range in format 'start-end'")
+    year_range: YearRange = Depends(parse_year_range)
 ):
     """
     Get historical trends for an environmental indicator
@@ -260,54 +293,35 @@ async def get_indicator_trends(
     - **region**: Geographic region
     - **year_range**: Year range in format '2000-2025'
     """
-    try:
-        start_year, end_year = map(int, year_range.split("-"))
-        if start_year < settings.DATA_YEAR_MIN or end_year > settings.DATA_YEAR_MAX:
-            raise ValueError("Year range out of bounds")
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid year range format. Use 'YYYY-YYYY'")
-    
     # Generate data for every 5 years
-    years = list(range(start_year, end_year + 1, 5))
-    if years[-1] != end_year:
-        years.append(end_year)
+    years = _years_for(year_range.start, year_range.end)
     
-    import asyncio
+    _, value_attr, unit = _SIMULATOR_DISPATCH[indicator]
     
     async def get_trend_data(year: int):
-        if indicator == DataIndicator.NDVI:
-            data = await environmental_simulator.simulate_ndvi_data(region, year)
-            return {
-                "year": year,
-                "value": data.average_ndvi,
-                "unit": "NDVI",
-                "trend": data.trend
-            }
-        elif indicator == DataIndicator.GLACIER:
-            data = await environmental_simulator.simulate_glacier_data(region, year)
-            return {
-                "year": year,
-                "value": data.glacier_area_km2,
-                "unit": "km²",
-                "trend": data.trend
-            }
-        elif indicator == DataIndicator.URBAN:
-            data = await environmental_simulator.simulate_urban_data(region, year)
-            return {
-                "year": year,
-                "value": data.urban_area_km2,
-                "unit": "km²",
-                "trend": data.trend
-            }
-        elif indicator == DataIndicator.TEMPERATURE:
-            data = await environmental_simulator.simulate_temperature_data(region, year)
-            return {
-                "year": year,
-                "value": data.average_temperature_c,
-                "unit": "°C",
-                "trend": data.trend
-            }
+        data = await _simulate(indicator, region, year)
+        return {
+            "year": year,
+            "value": getattr(data, value_attr),
+            "unit": unit,
+            "trend": data.trend
+        }
     
-    trend_data = await asyncio.gather(*[get_trend_data(y) for y in years])
+    # Tasks are created in ascending year order, so results are already sorted
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(get_trend_data(y)) for y in years]
     
-    return sorted(trend_data, key=lambda x: x["year"])
+    return [task.result() for task in tasks]
+
+# Years advertised as map defaults, i.e. the combinations most clients ask for
+_WARM_YEARS = tuple(range(DATA_YEAR_MIN, DATA_YEAR_MAX + 1, 5))
+
+async def warm_cache():
+    """Pre-populate the response cache for every region and default year"""
+    routes = (get_ndvi_data, get_glacier_data, get_urban_data, get_temperature_data)
+    results = await asyncio.gather(
+        *(route.warm(year=year, region=region) for route in routes for region in Region for year in _WARM_YEARS),
+        return_exceptions=True
+    )
+    failures = sum(isinstance(result, BaseException) for result in results)
+    logger.info("Response cache warmed: %d entries, %d failed", len(results) - failures, failures)
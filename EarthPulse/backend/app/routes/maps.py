@@ -3,18 +3,62 @@ Map Services API Routes
 Provides map tile endpoints and geographic data services
 """
 
-from fastapi import APIRouter, Query, HTTPException
-from typing import List, Dict, Optional
+from fastapi import APIRouter, Path, Query, HTTPException, Request
+from typing import List, Dict, Optional, Tuple
 from pydantic import BaseModel
 
 from app.models.geographic import get_region_info, get_region_boundary, get_region_center
 from app.models.environmental import Region
-from app.config.settings import settings
-from fastapi.responses import StreamingResponse
+from app.config.settings import settings, SUPPORTED_REGIONS, DATA_YEAR_MIN, DATA_YEAR_MAX, SUPPORTED_INDICATORS_SET
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from app.services.cache import cache_service, conditional_json, static_headers
+from app.utils.helpers import generate_cache_key
+from cachetools import TTLCache
+from starlette.background import BackgroundTask
+from PIL import Image, ImageDraw
+from functools import lru_cache
+import asyncio
+from datetime import datetime, timezone
+from email.utils import formatdate
 import httpx
 import io
+import orjson
+import time
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# NASA GIBS WMS endpoint (EPSG:4326 "best" imagery)
+_GIBS_BASE_URL = "https://gibs.earthdata.nasa.gov"
+_GIBS_WMS_PATH = "/wms/epsg4326/best/wms.cgi"
+
+# Imagery for a fixed (layer, date, bbox, size) never changes: keep recent
+# snapshots in process (~256 x 200KB) and, when Redis is configured, for the
+# 30 days advertised by /configuration
+_GIBS_CACHE: TTLCache = TTLCache(maxsize=256, ttl=86400)
+_GIBS_REDIS_TTL = 30 * 86400
+_GIBS_FORMAT = "image/png"
+_WEBP_FORMAT = "image/webp"
+
+# Shared GIBS client, opened and closed by the application lifespan
+_GIBS_CLIENT: Optional[httpx.AsyncClient] = None
+
+async def open_gibs_client():
+    """Create the pooled HTTP/2 client used by the GIBS proxy"""
+    global _GIBS_CLIENT
+    if _GIBS_CLIENT is None:
+        _GIBS_CLIENT = httpx.AsyncClient(
+            base_url=_GIBS_BASE_URL,
+            timeout=20,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            http2=True
+        )
+
+async def close_gibs_client():
+    """Close the shared GIBS client"""
+    global _GIBS_CLIENT
+    if _GIBS_CLIENT is not None:
+        await _GIBS_CLIENT.aclose()
+        _GIBS_CLIENT = None
 
 class MapTileRequest(BaseModel):
     """Map tile request data"""
@@ -30,12 +74,11 @@ class RegionMapData(BaseModel):
     bounds: Dict[str, float]  # {min_lng, min_lat, max_lng, max_lat}
     coordinates: List[List[float]]  # [[lng, lat], ...]
 
-@router.get("/regions")
-async def get_regions():
-    """Get all supported regions with their geographic data"""
+def _build_regions_response() -> Dict:
+    """Assemble the /regions payload from the static region tables"""
     regions_data = []
     
-    for region_id in ["nepal_himalayas", "kathmandu_valley", "annapurna_region", "everest_region"]:
+    for region_id in SUPPORTED_REGIONS:
         region_info = get_region_info(region_id)
         if region_info:
             boundary = get_region_boundary(region_id)
@@ -52,7 +95,7 @@ async def get_regions():
                     "max_lat": region_info.bounding_box.max_latitude
                 },
                 coordinates=boundary or []
-            ))
+            ).model_dump())
     
     return {
         "regions": regions_data,
@@ -60,16 +103,147 @@ async def get_regions():
         "default_region": "nepal_himalayas"
     }
 
-@router.get("/regions/{region_id}")
-async def get_region_details(region_id: str):
-    """Get detailed geographic information for a specific region"""
-    if region_id not in ["nepal_himalayas", "kathmandu_valley", "annapurna_region", "everest_region"]:
-        raise HTTPException(status_code=404, detail=f"Region '{region_id}' not found")
-    
+# Static payloads, built once at import time
+_AVAILABLE_YEARS = tuple(range(DATA_YEAR_MIN, DATA_YEAR_MAX + 1))
+_REGIONS_RESPONSE = _build_regions_response()
+
+_OVERLAYS = [
+    {
+        "id": "ndvi",
+        "name": "Vegetation Index (NDVI)",
+        "description": "Plant health and vegetation density",
+        "source": "MODIS",
+        "available_years": _AVAILABLE_YEARS,
+        "color_scheme": {
+            "min": "#8B4513",
+            "max": "#228B22",
+            "description": "Brown (low vegetation) to Green (high vegetation)"
+        },
+        "tile_template": "/api/v1/maps/overlays/ndvi/{year}/{z}/{x}/{y}"
+    },
+    {
+        "id": "glacier",
+        "name": "Glacier Coverage",
+        "description": "Ice extent and glacier boundaries",
+        "source": "Sentinel/Landsat",
+        "available_years": _AVAILABLE_YEARS,
+        "color_scheme": {
+            "min": "#FFFFFF",
+            "max": "#4169E1",
+            "description": "White (ice) to Blue (significant coverage)"
+        },
+        "tile_template": "/api/v1/maps/overlays/glacier/{year}/{z}/{x}/{y}"
+    },
+    {
+        "id": "urban",
+        "name": "Urban Expansion",
+        "description": "Built-up areas and urban development",
+        "source": "Landsat/Nightlight",
+        "available_years": _AVAILABLE_YEARS,
+        "color_scheme": {
+            "min": "#000080",
+            "max": "#FFD700",
+            "description": "Dark Blue (rural) to Gold (urban)"
+        },
+        "tile_template": "/api/v1/maps/overlays/urban/{year}/{z}/{x}/{y}"
+    },
+    {
+        "id": "temperature",
+        "name": "Land Surface Temperature",
+        "description": "Surface temperature mapping",
+        "source": "MODIS",
+        "available_years": _AVAILABLE_YEARS,
+        "color_scheme": {
+            "min": "#0000FF",
+            "max": "#FF0000",
+            "description": "Blue (cool) to Red (warm)"
+        },
+        "tile_template": "/api/v1/maps/overlays/temperature/{year}/{z}/{x}/{y}"
+    }
+]
+
+_OVERLAYS_RESPONSE = {
+    "overlays": _OVERLAYS,
+    "total_count": len(_OVERLAYS),
+    "supported_zoom_levels": "0-15",
+    "tile_size": 256,
+    "attribution": "Environmental data overlays for Nepal Himalayan region"
+}
+
+_STYLES = [
+    {
+        "id": "dark",
+        "name": "Dark Theme",
+        "description": "Dark theme optimized for environmental data visualization",
+        "url": "https://api.mapbox.com/styles/v1/mapbox/dark-v10/tiles/{z}/{x}/{y}?access_token={token}",
+        "attribution": "© OpenStreetMap contributors, © Mapbox",
+        "recommended_for": ["Environmental data overlays", "Night imagery", "Scientific visualization"]
+    },
+    {
+        "id": "satellite",
+        "name": "Satellite Imagery",
+        "description": "High-resolution satellite imagery",
+        "url": "https://api.mapbox.com/styles/v1/mapbox/satellite-v9/tiles/{z}/{x}/{y}?access_token={token}",
+        "attribution": "© Mapbox, © Maxar Technologies",
+        "recommended_for": ["Current state visualization", "High-resolution analysis", "Ground truth"]
+    },
+    {
+        "id": "venue",
+        "name": "Light Theme",
+        "description": "Light theme for reports and presentations",
+        "url": "https://api.mapbox.com/styles/v1/mapbox/light-v10/tiles/{z}/{x}/{y}?access_token={token}",
+        "attribution": "© OpenStreetMap contributors, © Mapbox",
+        "recommended_for": ["Reports", "Presentations", "Print publications"]
+    }
+]
+
+_STYLES_RESPONSE = {
+    "styles": _STYLES,
+    "default_style": "dark",
+    "environmental_recommended": ["dark", "satellite"],
+    "note": "Configure Mapbox token to enable real map tiles"
+}
+
+_CONFIG_RESPONSE = {
+    "default_view": {
+        "center": [85.3240, 27.7172],  # Nepal center
+        "zoom": 7,
+        "region": "nepal_himalayas"
+    },
+    "max_bounds": {
+        "northeast": [88.5, 30.5],
+        "southwest": [80.0, 26.0]
+    },
+    "controls": {
+        "fullscreen": True,
+        "zoom": True,
+        "attribution": True,
+        "geolocation": False,
+        "scale": True
+    },
+    "overlays": {
+        "default_opacity": 0.7,
+        "max_opacity": 1.0,
+        "min_opacity": 0.3
+    },
+    "tiles": {
+        "size": 256,
+        "format": "png",
+        "cache_duration": "30d"
+    },
+    "environmental_indicators": {
+        "default_years": [2000, 2005, 2010, 2015, 2020, 2025],
+        "animation_interval": 2000,
+        "auto_play": False
+    },
+    "supported_formats": ["png", "jpeg", "geotiff"],
+    "api_status": "mock_mode",
+    "real_integration": "Ready for NASA Earth Observation API"
+}
+
+def _build_region_details(region_id: str) -> Dict:
+    """Assemble the detail payload for one region"""
     region_info = get_region_info(region_id)
-    if not region_info:
-        raise HTTPException(status_code=500, detail="Region data not available")
-    
     boundary = get_region_boundary(region_id)
     center = get_region_center(region_id)
     
@@ -103,6 +277,37 @@ async def get_region_details(region_id: str):
         "coordinates": boundary or []
     }
 
+# Pre-encoded bodies for the static routes
+_REGIONS_BYTES = orjson.dumps(_REGIONS_RESPONSE)
+_OVERLAYS_BYTES = orjson.dumps(_OVERLAYS_RESPONSE)
+_STYLES_BYTES = orjson.dumps(_STYLES_RESPONSE)
+_CONFIG_BYTES = orjson.dumps(_CONFIG_RESPONSE)
+_REGIONS_HEADERS = static_headers(_REGIONS_BYTES)
+_OVERLAYS_HEADERS = static_headers(_OVERLAYS_BYTES)
+_STYLES_HEADERS = static_headers(_STYLES_BYTES)
+_CONFIG_HEADERS = static_headers(_CONFIG_BYTES)
+
+def _encode_region_details(region_id: str) -> Tuple[bytes, Dict[str, str]]:
+    """Pre-encode one region's detail payload with its caching headers"""
+    body = orjson.dumps(_build_region_details(region_id))
+    return body, static_headers(body)
+
+_REGION_DETAILS: Dict[str, Tuple[bytes, Dict[str, str]]] = {
+    region_id: _encode_region_details(region_id) for region_id in SUPPORTED_REGIONS
+}
+
+@router.get("/regions")
+async def get_regions(request: Request):
+    """Get all supported regions with their geographic data"""
+    return conditional_json(request, _REGIONS_BYTES, _REGIONS_HEADERS)
+
+@router.get("/regions/{region_id}")
+async def get_region_details(request: Request, region_id: Region = Path(..., description="Geographic region")):
+    """Get detailed geographic information for a specific region"""
+    # FastAPI rejects unknown regions against the enum before we get here
+    body, headers = _REGION_DETAILS[region_id]
+    return conditional_json(request, body, headers)
+
 @router.get("/tiles/{z}/{x}/{y}")
 async def get_map_tile(z: int, x: int, y: int):
     """Generate or proxy map tiles for environmental visualization"""
@@ -123,70 +328,9 @@ async def get_map_tile(z: int, x: int, y: int):
     }
 
 @router.get("/overlays")
-async def get_environmental_overlays():
+async def get_environmental_overlays(request: Request):
     """Get available environmental data overlay layers"""
-    overlays = [
-        {
-            "id": "ndvi",
-            "name": "Vegetation Index (NDVI)",
-            "description": "Plant health and vegetation density",
-            "source": "MODIS",
-            "available_years": list(range(2000, 2026)),
-            "color_scheme": {
-                "min": "#8B4513",
-                "max": "#228B22",
-                "description": "Brown (low vegetation) to Green (high vegetation)"
-            },
-            "tile_template": "/api/v1/maps/overlays/ndvi/{year}/{z}/{x}/{y}"
-        },
-        {
-            "id": "glacier",
-            "name": "Glacier Coverage",
-            "description": "Ice extent and glacier boundaries",
-            "source": "Sentinel/Landsat",
-            "available_years": list(range(2000, 2026)),
-            "color_scheme": {
-                "min": "#FFFFFF",
-                "max": "#4169E1",
-                "description": "White (ice) to Blue (significant coverage)"
-            },
-            "tile_template": "/api/v1/maps/overlays/glacier/{year}/{z}/{x}/{y}"
-        },
-        {
-            "id": "urban",
-            "name": "Urban Expansion",
-            "description": "Built-up areas and urban development",
-            "source": "Landsat/Nightlight",
-            "available_years": list(range(2000, 2026)),
-            "color_scheme": {
-                "min": "#000080",
-                "max": "#FFD700",
-                "description": "Dark Blue (rural) to Gold (urban)"
-            },
-            "tile_template": "/api/v1/maps/overlays/urban/{year}/{z}/{x}/{y}"
-        },
-        {
-            "id": "temperature",
-            "name": "Land Surface Temperature",
-            "description": "Surface temperature mapping",
-            "source": "MODIS",
-            "available_years": list(range(2000, 2026)),
-            "color_scheme": {
-                "min": "#0000FF",
-                "max": "#FF0000",
-                "description": "Blue (cool) to Red (warm)"
-            },
-            "tile_template": "/api/v1/maps/overlays/temperature/{year}/{z}/{x}/{y}"
-        }
-    ]
-    
-    return {
-        "overlays": overlays,
-        "total_count": len(overlays),
-        "supported_zoom_levels": "0-15",
-        "tile_size": 256,
-        "attribution": "Environmental data overlays for Nepal Himalayan region"
-    }
+    return conditional_json(request, _OVERLAYS_BYTES, _OVERLAYS_HEADERS)
 
 @router.get("/overlays/{indicator}/{year}/{z}/{x}/{y}")
 async def get_environmental_overlay_tile(
@@ -199,10 +343,10 @@ async def get_environmental_overlay_tile(
     """Generate environmental data overlay tile"""
     
     # Validate inputs
-    if indicator not in ["ndvi", "glacier", "urban", "temperature"]:
+    if indicator not in SUPPORTED_INDICATORS_SET:
         raise HTTPException(status_code=400, detail="Invalid indicator")
     
-    if year < settings.DATA_YEAR_MIN or year > settings.DATA_YEAR_MAX:
+    if year < DATA_YEAR_MIN or year > DATA_YEAR_MAX:
         raise HTTPException(status_code=400, detail="Year out of range")
     
     if z < 0 or z > 15:
@@ -222,90 +366,37 @@ async def get_environmental_overlay_tile(
     }
 
 @router.get("/styles")
-async def get_map_styles():
+async def get_map_styles(request: Request):
     """Get available map styles for environmental visualization"""
-    styles = [
-        {
-            "id": "dark",
-            "name": "Dark Theme",
-            "description": "Dark theme optimized for environmental data visualization",
-            "url": "https://api.mapbox.com/styles/v1/mapbox/dark-v10/tiles/{z}/{x}/{y}?access_token={token}",
-            "attribution": "© OpenStreetMap contributors, © Mapbox",
-            "recommended_for": ["Environmental data overlays", "Night imagery", "Scientific visualization"]
-        },
-        {
-            "id": "satellite",
-            "name": "Satellite Imagery",
-            "description": "High-resolution satellite imagery",
-            "url": "https://api.mapbox.com/styles/v1/mapbox/satellite-v9/tiles/{z}/{x}/{y}?access_token={token}",
-            "attribution": "© Mapbox, © Maxar Technologies",
-            "recommended_for": ["Current state visualization", "High-resolution analysis", "Ground truth"]
-        },
-        {
-            "id": "venue",
-            "name": "Light Theme",
-            "description": "Light theme for reports and presentations",
-            "url": "https://api.mapbox.com/styles/v1/mapbox/light-v10/tiles/{z}/{x}/{y}?access_token={token}",
-            "attribution": "© OpenStreetMap contributors, © Mapbox",
-            "recommended_for": ["Reports", "Presentations", "Print publications"]
-        }
-    ]
-    
-    return {
-        "styles": styles,
-        "default_style": "dark",
-        "environmental_recommended": ["dark", "satellite"],
-        "note": "Configure Mapbox token to enable real map tiles"
-    }
+    return conditional_json(request, _STYLES_BYTES, _STYLES_HEADERS)
 
 @router.get("/configuration")
-async def get_map_configuration():
+async def get_map_configuration(request: Request):
     """Get default map configuration for the application"""
+    return conditional_json(request, _CONFIG_BYTES, _CONFIG_HEADERS)
+
+# Browser/CDN lifetimes for image responses
+_PLACEHOLDER_MAX_AGE = 86400
+_GIBS_HISTORICAL_MAX_AGE = 7 * 86400
+_GIBS_RECENT_MAX_AGE = 3600
+
+def _image_cache_headers(max_age: int, immutable: bool = True) -> Dict[str, str]:
+    """Cache-Control and Expires headers for an image valid for max_age seconds"""
+    cache_control = f"public, max-age={max_age}, immutable" if immutable else f"public, max-age={max_age}"
     return {
-        "default_view": {
-            "center": [85.3240, 27.7172],  # Nepal center
-            "zoom": 7,
-            "region": "nepal_himalayas"
-        },
-        "max_bounds": {
-            "northeast": [88.5, 30.5],
-            "southwest": [80.0, 26.0]
-        },
-        "controls": {
-            "fullscreen": True,
-            "zoom": True,
-            "attribution": True,
-            "geolocation": False,
-            "scale": True
-        },
-        "overlays": {
-            "default_opacity": 0.7,
-            "max_opacity": 1.0,
-            "min_opacity": 0.3
-        },
-        "tiles": {
-            "size": 256,
-            "format": "png",
-            "cache_duration": "30d"
-        },
-        "environmental_indicators": {
-            "default_years": [2000, 2005, 2010, 2015, 2020, 2025],
-            "animation_interval": 2000,
-            "auto_play": False
-        },
-        "supported_formats": ["png", "jpeg", "geotiff"],
-        "api_status": "mock_mode",
-        "real_integration": "Ready for NASA Earth Observation API"
+        "Cache-Control": cache_control,
+        "Expires": formatdate(time.time() + max_age, usegmt=True)
     }
 
-@router.get("/placeholder/{width}/{height}")
-async def get_placeholder_image(width: int, height: int):
-    """Serve a simple placeholder image for storytelling snapshots"""
-    from PIL import Image, ImageDraw
-
-    w = max(32, min(2000, width))
-    h = max(32, min(2000, height))
+# Sizes requested by the frontend storytelling views, rendered at startup
+_COMMON_PLACEHOLDER_SIZES = (
+    (600, 400), (800, 600), (640, 480), (400, 300),
+    (1024, 768), (1200, 800), (320, 240), (256, 256)
+)
 
+@lru_cache(maxsize=32)
+def _render_placeholder(w: int, h: int) -> bytes:
+    """Render a placeholder PNG once per size"""
     img = Image.new('RGB', (w, h), color=(10, 25, 45))
     draw = ImageDraw.Draw(img)
 
@@ -320,13 +411,64 @@ async def get_placeholder_image(width: int, height: int):
 
     buffer = io.BytesIO()
     img.save(buffer, format='PNG')
-    buffer.seek(0)
-    return StreamingResponse(buffer, media_type="image/png")
+    return buffer.getvalue()
+
+def warm_placeholders():
+    """Pre-render the common placeholder sizes"""
+    for w, h in _COMMON_PLACEHOLDER_SIZES:
+        _render_placeholder(w, h)
+
+@router.get("/placeholder/{width}/{height}")
+async def get_placeholder_image(width: int, height: int):
+    """Serve a simple placeholder image for storytelling snapshots"""
+    w = max(32, min(2000, width))
+    h = max(32, min(2000, height))
+
+    # Content-Length is set by Response from the body
+    return Response(
+        content=_render_placeholder(w, h),
+        media_type="image/png",
+        headers=_image_cache_headers(_PLACEHOLDER_MAX_AGE)
+    )
+
+async def _relay_gibs_image(resp: httpx.Response, cache_key: tuple, redis_key: str, content_type: str):
+    """Yield GIBS image chunks to the client and cache the full image once complete"""
+    chunks = []
+    async for chunk in resp.aiter_bytes(chunk_size=65536):
+        chunks.append(chunk)
+        yield chunk
+
+    content = b"".join(chunks)
+    _GIBS_CACHE[cache_key] = (content_type, content)
+    if cache_service.is_persistent:
+        await cache_service.set(redis_key, content, _GIBS_REDIS_TTL)
+
+async def _fetch_gibs_image(params: Dict[str, str]) -> Tuple[str, bytes]:
+    """Fetch a complete GIBS image, raising 502 on upstream failure"""
+    try:
+        if _GIBS_CLIENT is None:
+            await open_gibs_client()
+        resp = await _GIBS_CLIENT.get(_GIBS_WMS_PATH, params=params)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Failed to fetch GIBS image: {e}")
+
+    content_type = resp.headers.get("Content-Type", "")
+    if resp.status_code != 200 or not content_type.startswith("image/"):
+        raise HTTPException(status_code=502, detail=f"GIBS error: {resp.status_code}")
+    return content_type, resp.content
+
+def _encode_webp(content: bytes) -> bytes:
+    """Re-encode a GIBS image as WebP"""
+    with Image.open(io.BytesIO(content)) as img:
+        buffer = io.BytesIO()
+        img.save(buffer, format="WEBP", quality=85, method=4)
+    return buffer.getvalue()
 
 @router.get("/gibs/snapshot")
 async def get_gibs_snapshot(
+    request: Request,
     layer: str = Query(default="MODIS_Terra_NDVI_16Day", description="GIBS layer name"),
-    year: int = Query(default=2020, ge=settings.DATA_YEAR_MIN, le=settings.DATA_YEAR_MAX),
+    year: int = Query(default=2020, ge=DATA_YEAR_MIN, le=DATA_YEAR_MAX),
     month: int = Query(default=6, ge=1, le=12),
     day: int = Query(default=15, ge=1, le=31),
     width: int = Query(default=600, ge=64, le=2000),
@@ -345,15 +487,13 @@ async def get_gibs_snapshot(
         raise HTTPException(status_code=400, detail="Invalid bbox format. Use 'minLat,minLon,maxLat,maxLon'")
 
     date_str = f"{year:04d}-{month:02d}-{day:02d}"
-    # GIBS best WMS in EPSG:4326
-    base_url = "https://gibs.earthdata.nasa.gov/wms/epsg4326/best/wms.cgi"
     params = {
         "service": "WMS",
         "request": "GetMap",
         "version": "1.3.0",
         "layers": layer,
         "styles": "",
-        "format": "image/png",
+        "format": _GIBS_FORMAT,
         "transparent": "true",
         "height": str(height),
         "width": str(width),
@@ -362,12 +502,70 @@ async def get_gibs_snapshot(
         "time": date_str
     }
 
+    # Imagery for past days is final; today's composite may still be filled in
+    if date_str < datetime.now(timezone.utc).strftime("%Y-%m-%d"):
+        headers = _image_cache_headers(_GIBS_HISTORICAL_MAX_AGE)
+    else:
+        headers = _image_cache_headers(_GIBS_RECENT_MAX_AGE, immutable=False)
+
+    # The body depends on the negotiated format
+    headers["Vary"] = "Accept"
+    wants_webp = "image/webp" in request.headers.get("accept", "")
+
+    cache_key = (layer, date_str, bbox, width, height)
+    webp_key = cache_key + ("webp",)
+    if wants_webp:
+        cached_image = _GIBS_CACHE.get(webp_key)
+        if cached_image is not None:
+            return Response(content=cached_image[1], media_type=_WEBP_FORMAT, headers=headers)
+
+    content_type, content = _GIBS_CACHE.get(cache_key, (None, None))
+
+    redis_key = f"gibs:{generate_cache_key(*cache_key)}"
+    if content is None and cache_service.is_persistent:
+        content = await cache_service.get(redis_key)
+        if content is not None:
+            content_type = _GIBS_FORMAT
+            _GIBS_CACHE[cache_key] = (content_type, content)
+
+    if wants_webp:
+        # Transcoding needs the whole image, so skip the streaming relay
+        if content is None:
+            content_type, content = await _fetch_gibs_image(params)
+            _GIBS_CACHE[cache_key] = (content_type, content)
+            if cache_service.is_persistent:
+                await cache_service.set(redis_key, content, _GIBS_REDIS_TTL)
+        webp = await asyncio.to_thread(_encode_webp, content)
+        _GIBS_CACHE[webp_key] = (_WEBP_FORMAT, webp)
+        return Response(content=webp, media_type=_WEBP_FORMAT, headers=headers)
+
+    if content is not None:
+        return Response(content=content, media_type=content_type, headers=headers)
+
     try:
-        async with httpx.AsyncClient(timeout=20) as client:
-            resp = await client.get(base_url, params=params)
-            if resp.status_code != 200 or not resp.headers.get("Content-Type", "").startswith("image/"):
-                raise HTTPException(status_code=502, detail=f"GIBS error: {resp.status_code}")
-            return StreamingResponse(io.BytesIO(resp.content), media_type=resp.headers.get("Content-Type", "image/png"))
+        if _GIBS_CLIENT is None:
+            await open_gibs_client()
+        upstream_request = _GIBS_CLIENT.build_request("GET", _GIBS_WMS_PATH, params=params)
+        resp = await _GIBS_CLIENT.send(upstream_request, stream=True)
+        content_type = resp.headers.get("Content-Type", "")
+        if resp.status_code != 200 or not content_type.startswith("image/"):
+            await resp.aclose()
+            raise HTTPException(status_code=502, detail=f"GIBS error: {resp.status_code}")
+
+        # aiter_bytes() decodes any transfer compression, so the upstream
+        # length is only valid for identity-encoded bodies
+        content_length = resp.headers.get("Content-Length")
+        if content_length is not None and "Content-Encoding" not in resp.headers:
+            headers["Content-Length"] = content_length
+
+        # Relay the upstream body as it arrives; the connection is released
+        # once the response has been sent
+        return StreamingResponse(
+            _relay_gibs_image(resp, cache_key, redis_key, content_type),
+            media_type=content_type,
+            headers=headers,
+            background=BackgroundTask(resp.aclose)
+        )
     except HTTPException:
         raise
     except Exception as e:
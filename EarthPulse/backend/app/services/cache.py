@@ -0,0 +1,223 @@
+"""
+Response Caching Service
+Redis-backed cache for deterministic API responses with an in-process fallback
+"""
+
+import time
+import hashlib
+import inspect
+import logging
+from functools import wraps
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+import orjson
+from cachetools import TTLCache
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from app.config.settings import settings
+from app.utils.helpers import generate_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Cache lifetime for payloads that never change between deploys
+STATIC_MAX_AGE = 86400
+
+# Bound on the in-process fallback store; entries also carry their own
+# expiry, the TTLCache ttl only caps how long any entry can linger
+_LOCAL_MAXSIZE = 4096
+
+class CacheService:
+    """Key/value cache for serialized responses"""
+
+    def __init__(self):
+        self.redis = None
+        self.is_initialized = False
+        self._local: TTLCache = TTLCache(maxsize=_LOCAL_MAXSIZE, ttl=STATIC_MAX_AGE)
+
+    async def initialize(self):
+        """Connect to Redis, falling back to the in-process store"""
+        if settings.USE_MOCK_DATA:
+            logger.info("Mock data mode, using in-process response cache")
+            self.is_initialized = True
+            return
+
+        try:
+            import redis.asyncio as aioredis
+
+            self.redis = aioredis.from_url(settings.REDIS_URL)
+            await self.redis.ping()
+            logger.info("✅ Redis response cache connected")
+        except Exception as e:
+            logger.warning("Redis unavailable (%s), using in-process response cache", e)
+            self.redis = None
+        self.is_initialized = True
+
+    @property
+    def is_persistent(self) -> bool:
+        """Whether entries survive restarts and are shared across workers"""
+        return self.redis is not None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get cached bytes for a key, or None on a miss"""
+        if self.redis is not None:
+            try:
+                return await self.redis.get(key)
+            except Exception as e:
+                logger.error("Redis GET failed: %s", e)
+                return None
+
+        return self._get_local(key)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        """Get cached bytes for several keys in one round-trip, None for each miss"""
+        if not keys:
+            return []
+        if self.redis is not None:
+            try:
+                return await self.redis.mget(keys)
+            except Exception as e:
+                logger.error("Redis MGET failed: %s", e)
+                return [None] * len(keys)
+
+        return [self._get_local(key) for key in keys]
+
+    def _get_local(self, key: str) -> Optional[bytes]:
+        """Read a key from the in-process store, dropping it once expired"""
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._local.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, expire: int):
+        """Store bytes under a key for `expire` seconds"""
+        if self.redis is not None:
+            try:
+                await self.redis.set(key, value, ex=expire)
+            except Exception as e:
+                logger.error("Redis SET failed: %s", e)
+            return
+
+        self._local[key] = (time.monotonic() + expire, value)
+
+    async def set_many(self, items: Mapping[str, bytes], expire: int):
+        """Store several keys for `expire` seconds in one round-trip"""
+        if not items:
+            return
+        if self.redis is not None:
+            # MSET can't set a TTL, so pipeline one SET EX per key instead
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for key, value in items.items():
+                        pipe.set(key, value, ex=expire)
+                    await pipe.execute()
+            except Exception as e:
+                logger.error("Redis pipelined SET failed: %s", e)
+            return
+
+        expires_at = time.monotonic() + expire
+        for key, value in items.items():
+            self._local[key] = (expires_at, value)
+
+    async def claim(self, key: str, expire: int) -> bool:
+        """Set a marker key only if absent; True if this process set it.
+
+        Without Redis every process has its own store, so the claim always
+        succeeds.
+        """
+        if self.redis is not None:
+            try:
+                return bool(await self.redis.set(key, b"1", ex=expire, nx=True))
+            except Exception as e:
+                logger.error("Redis SET NX failed: %s", e)
+        return True
+
+    async def close(self):
+        """Close the Redis connection"""
+        if self.redis is not None:
+            await self.redis.close()
+            self.redis = None
+        self._local.clear()
+        self.is_initialized = False
+
+def _encode_default(obj: Any) -> Any:
+    """orjson fallback for Pydantic models and read-only mappings"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def encode_json(value: Any) -> bytes:
+    """Serialize a route result (models, dicts, lists) to JSON bytes"""
+    return orjson.dumps(value, default=_encode_default)
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+def static_headers(body: bytes) -> Dict[str, str]:
+    """Caching headers for a body fixed at import time"""
+    return {"Cache-Control": f"public, max-age={STATIC_MAX_AGE}", "ETag": make_etag(body)}
+
+def conditional_json(request: Request, body: bytes, headers: Mapping[str, str]) -> Response:
+    """Return 304 when the client already holds this body, the JSON otherwise"""
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def cached(expire: int, namespace: str = "ep-cache"):
+    """Cache a GET route's JSON response keyed by its path and query parameters"""
+    cache_control = f"public, max-age={expire}, must-revalidate"
+
+    def decorator(func: Callable):
+        # Ask FastAPI for the request as well, so If-None-Match can be answered
+        signature = inspect.signature(func)
+        parameters = [
+            *signature.parameters.values(),
+            inspect.Parameter("_cache_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+        ]
+
+        async def fill(*args, **kwargs) -> bytes:
+            """Get the cached body for these route arguments, computing it on a miss"""
+            key = f"{namespace}:{generate_cache_key(func.__module__, func.__qualname__, *sorted(kwargs.items()))}"
+
+            body = await cache_service.get(key)
+            if body is None:
+                body = encode_json(await func(*args, **kwargs))
+                await cache_service.set(key, body, expire)
+            return body
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            request = kwargs.pop("_cache_request")
+            body = await fill(*args, **kwargs)
+
+            headers = {"Cache-Control": cache_control, "ETag": make_etag(body)}
+            return conditional_json(request, body, headers)
+
+        wrapper.__signature__ = signature.replace(parameters=parameters)
+        # Lets startup code pre-populate entries; pass every route parameter
+        # by keyword, as FastAPI does
+        wrapper.warm = fill
+        return wrapper
+
+    return decorator
+
+# Global cache service instance
+cache_service = CacheService()
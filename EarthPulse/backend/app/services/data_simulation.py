@@ -3,11 +3,13 @@ Realistic Environmental Data Simulation Service
 Generates credible mock data that follows real-world environmental trends
 """
 
-import random
 import math
 import asyncio
 import logging
+import zlib
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 import numpy as np
 
@@ -15,11 +17,89 @@ from app.models.environmental import (
     NDVIData, GlacierData, UrbanData, TemperatureData,
     EnvironmentalDataPoint, Region, DataIndicator, DataSource
 )
-from app.models.geographic import get_region_info, get_region_boundary, get_region_center
+from app.models.geographic import get_region_info, get_region_boundary_array, get_region_center
 from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# (lower, upper) clip bounds for spatial sample values; inf leaves a side open
+_POINT_VALUE_BOUNDS = {
+    "ndvi": (-1.0, 1.0),
+    "temperature": (-50.0, 50.0),
+    "glacier": (0.0, np.inf),
+    "urban": (0.0, np.inf),
+}
+
+# numba is optional: when installed, large batches are clipped by a compiled
+# loop; below this size the NumPy call is cheaper than the JIT dispatch
+_NUMBA_MIN_POINTS = 4096
+
+try:
+    from numba import njit
+except ImportError:
+    _clip_kernel = None
+else:
+    @njit(cache=True, fastmath=True)
+    def _clip_kernel(values, lower, upper):
+        out = np.empty_like(values)
+        for i in range(values.shape[0]):
+            value = values[i]
+            if value < lower:
+                value = lower
+            elif value > upper:
+                value = upper
+            out[i] = value
+        return out
+
+def _clip_values(values: np.ndarray, lower: float, upper: float) -> np.ndarray:
+    """Clip sample values to an indicator's bounds"""
+    if _clip_kernel is not None and values.shape[0] >= _NUMBA_MIN_POINTS:
+        return _clip_kernel(values, lower, upper)
+    return np.clip(values, lower, upper)
+
+@dataclass(frozen=True)
+class DataPointBatch:
+    """Spatial data points stored column-wise, one array per field"""
+    longitude: np.ndarray
+    latitude: np.ndarray
+    value: np.ndarray
+    confidence: np.ndarray
+    timestamp: np.ndarray  # datetime64[s]
+    
+    def __len__(self) -> int:
+        return len(self.value)
+    
+    def to_points(self) -> List[EnvironmentalDataPoint]:
+        """Materialize the API's list of data point models"""
+        return [
+            EnvironmentalDataPoint.fast_from_row(
+                longitude=longitude,
+                latitude=latitude,
+                value=value,
+                confidence=confidence,
+                timestamp=timestamp
+            )
+            for longitude, latitude, value, confidence, timestamp in zip(
+                self.longitude.tolist(),
+                self.latitude.tolist(),
+                self.value.tolist(),
+                self.confidence.tolist(),
+                self.timestamp.tolist()
+            )
+        ]
+
+def _seeded_rng(indicator: str, region_id: str, year: int) -> np.random.Generator:
+    """Generator seeded from (indicator, region, year), stable across processes"""
+    return np.random.default_rng(zlib.crc32(f"{indicator}:{region_id}:{year}".encode()))
+
+def _geometric_sum(first_term: float, ratio: float, count: int) -> float:
+    """Sum of first_term * ratio**y for y in range(count), in closed form"""
+    if count <= 0:
+        return 0.0
+    if ratio == 1:
+        return first_term * count
+    return first_term * (ratio ** count - 1) / (ratio - 1)
+
 class EnvironmentalDataSimulator:
     """Simulates realistic environmental data based on actual climate trends"""
     
@@ -52,7 +132,21 @@ class EnvironmentalDataSimulator:
     }
     
     def __init__(self):
+        # Generator for draws outside the seeded simulator cores
+        self._rng = np.random.default_rng(settings.RANDOM_SEED)
+        # Simulated API delay range in seconds, None when delays are disabled
+        self._delay_bounds = (
+            (settings.API_DELAY_MS * 0.0005, settings.API_DELAY_MS * 0.0015)
+            if settings.SIMULATE_API_DELAY else None
+        )
         self.region_adjustments = self._calculate_region_adjustments()
+        self.region_bboxes = self._calculate_region_bboxes()
+        # (trend config, region factor) per (region, indicator), one lookup per call
+        self._params = {
+            (region_id, indicator): (self.REAL_TRENDS[indicator], factors[indicator])
+            for region_id, factors in self.region_adjustments.items()
+            for indicator in self.REAL_TRENDS
+        }
     
     def _calculate_region_adjustments(self) -> Dict[str, Dict[str, float]]:
         """Calculate region-specific adjustments based on geographic characteristics"""
@@ -83,29 +177,74 @@ class EnvironmentalDataSimulator:
             }
         }
     
+    def _calculate_region_bboxes(self) -> Dict[str, Tuple[float, float, float, float]]:
+        """(min_lng, max_lng, min_lat, max_lat) of every region with a usable boundary"""
+        bboxes = {}
+        for region_id in self.region_adjustments:
+            boundary = get_region_boundary_array(region_id)
+            if boundary is None or len(boundary) < 3:
+                continue
+            min_lng, min_lat = boundary.min(axis=0).tolist()
+            max_lng, max_lat = boundary.max(axis=0).tolist()
+            bboxes[region_id] = (min_lng, max_lng, min_lat, max_lat)
+        return bboxes
+    
     async def simulate_ndvi_data(self, region: Region, year: int) -> NDVIData:
         """Simulate realistic NDVI data with NASA API integration"""
-        await self._simulate_api_delay()
+        region_id = region.value
         
         # Try to fetch real NASA data first if not using mock data
         if not settings.USE_MOCK_DATA:
+            # The real fetch has its own latency; the simulated delay is only
+            # paid by _run_cached when falling back to a cold simulation
             try:
                 from app.services.nasa_api import nasa_client
-                real_data = await nasa_client.fetch_modis_ndvi(region.value, year)
+                real_data = await nasa_client.fetch_modis_ndvi(region_id, year)
                 
                 if real_data and real_data.get("data"):
                     # Process real NASA data
-                    logger.info(f"Using real NASA MODIS data for {region.value} in {year}")
+                    logger.info(f"Using real NASA MODIS data for {region_id} in {year}")
                     return self._process_real_ndvi_data(real_data, region, year)
                 else:
-                    logger.warning(f"No real NASA data available for {region.value} in {year}, falling back to simulation")
+                    logger.warning(f"No real NASA data available for {region_id} in {year}, falling back to simulation")
             except Exception as e:
                 logger.error(f"Error fetching real NASA data: {e}, falling back to simulation")
         
         # Fall back to simulation
-        logger.info(f"Using simulated NDVI data for {region.value} in {year}")
-        trend_config = self.REAL_TRENDS["ndvi"]
-        region_factor = self.region_adjustments[region.value]["ndvi"]
+        logger.info(f"Using simulated NDVI data for {region_id} in {year}")
+        return await self._run_cached(self._compute_ndvi, region, year)
+    
+    async def simulate_glacier_data(self, region: Region, year: int) -> GlacierData:
+        """Simulate realistic glacier retreat data"""
+        return await self._run_cached(self._compute_glacier, region, year)
+    
+    async def simulate_urban_data(self, region: Region, year: int) -> UrbanData:
+        """Simulate realistic urban expansion"""
+        return await self._run_cached(self._compute_urban, region, year)
+    
+    async def simulate_temperature_data(self, region: Region, year: int) -> TemperatureData:
+        """Simulate realistic temperature warming"""
+        return await self._run_cached(self._compute_temperature, region, year)
+    
+    async def _run_cached(self, compute, region: Region, year: int):
+        """Run a memoized simulator core, paying the simulated API delay only on a miss"""
+        hits = compute.cache_info().hits
+        result = compute(region, year)
+        if self._delay_bounds is not None and compute.cache_info().hits == hits:
+            await self._simulate_api_delay()
+        return result
+    
+    # The _compute_* cores are pure functions of (region, year): each draws from
+    # its own deterministically seeded generator, so memoizing them returns
+    # exactly what a fresh run would. Results are shared between callers, so
+    # the models are frozen and their data points are tuples.
+    
+    @lru_cache(maxsize=4096)
+    def _compute_ndvi(self, region: Region, year: int) -> NDVIData:
+        """Simulated NDVI data for a region and year"""
+        region_id = region.value
+        rng = _seeded_rng("ndvi", region_id, year)
+        trend_config, region_factor = self._params[(region_id, "ndvi")]
         
         # Calculate base NDVI value with trend
         years_from_2000 = year - 2000
@@ -113,11 +252,11 @@ class EnvironmentalDataSimulator:
         base_value *= region_factor
         
         # Add realistic variation
-        variation = random.uniform(-trend_config["variation"], trend_config["variation"])
+        variation = float(rng.uniform(-trend_config["variation"], trend_config["variation"]))
         avg_ndvi = max(0.0, min(1.0, base_value + variation))
         
         # Calculate vegetation coverage
-        vegetation_coverage = max(0, min(100, avg_ndvi * 85 + random.uniform(-5, 10)))
+        vegetation_coverage = max(0, min(100, avg_ndvi * 85 + float(rng.uniform(-5, 10))))
         
         # Generate trend
         if years_from_2000 > 15:  # Recent years show different trends
@@ -125,14 +264,9 @@ class EnvironmentalDataSimulator:
         else:
             trend = "slightly_decreasing" if avg_ndvi < trend_config["base_value"] else "stable"
         
-        region_info = get_region_info(region.value)
-        if region_info:
-            boundary = get_region_boundary(region.value)
-            data_points = self._generate_spatial_data_points(
-                boundary, "ndvi", avg_ndvi, trend_config["variation"], year
-            )
-        else:
-            data_points = []
+        data_points = self._generate_spatial_data_points(
+            self.region_bboxes.get(region_id), "ndvi", avg_ndvi, trend_config["variation"], year, rng
+        )
         
         return NDVIData(
             year=year,
@@ -146,12 +280,11 @@ class EnvironmentalDataSimulator:
             trend=trend
         )
     
-    async def simulate_glacier_data(self, region: Region, year: int) -> GlacierData:
-        """Simulate realistic glacier retreat data"""
-        await self._simulate_api_delay()
-        
-        trend_config = self.REAL_TRENDS["glacier"]
-        region_factor = self.region_adjustments[region.value]["glacier"]
+    @lru_cache(maxsize=4096)
+    def _compute_glacier(self, region: Region, year: int) -> GlacierData:
+        """Simulated glacier retreat data for a region and year"""
+        region_id = region.value
+        trend_config, region_factor = self._params[(region_id, "glacier")]
         
         # Skip glaciers for regions without them
         if region_factor == 0:
@@ -164,37 +297,33 @@ class EnvironmentalDataSimulator:
                 trend="none"
             )
         
+        rng = _seeded_rng("glacier", region_id, year)
+        
         # Calculate glacier area with exponential retreat acceleration
         years_from_2000 = year - 2000
         
         # Calculate total retreat until this year
-        total_retreat = sum([
-            trend_config["retreat_rate"] * (trend_config["acceleration_factor"] ** y) 
-            for y in range(years_from_2000 + 1)
-        ])
+        total_retreat = _geometric_sum(
+            trend_config["retreat_rate"], trend_config["acceleration_factor"], years_from_2000 + 1
+        )
         
         glacier_area = max(0, trend_config["initial_area"] - total_retreat) * region_factor
         
         # Add yearly variation
-        variation_percent = random.uniform(
+        variation_percent = float(rng.uniform(
             -trend_config["variation_fraction"], 
             trend_config["variation_fraction"]
-        )
+        ))
         glacier_area *= (1 + variation_percent)
         
         # Estimate ice thickness
         base_thickness = 120 if glacier_area > 500 else 80
-        thickness_variation = random.uniform(-10, 15)
+        thickness_variation = float(rng.uniform(-10, 15))
         avg_thickness = base_thickness + thickness_variation
         
-        region_info = get_region_info(region.value)
-        if region_info:
-            boundary = get_region_boundary(region.value)
-            data_points = self._generate_spatial_data_points(
-                boundary, "glacier", glacier_area / 100, 0.2, year
-            )
-        else:
-            data_points = []
+        data_points = self._generate_spatial_data_points(
+            self.region_bboxes.get(region_id), "glacier", glacier_area / 100, 0.2, year, rng
+        )
         
         return GlacierData(
             year=year,
@@ -207,31 +336,28 @@ class EnvironmentalDataSimulator:
             trend="decreasing"
         )
     
-    async def simulate_urban_data(self, region: Region, year: int) -> UrbanData:
-        """Simulate realistic urban expansion"""
-        await self._simulate_api_delay()
-        
-        trend_config = self.REAL_TRENDS["urban"]
-        region_factor = self.region_adjustments[region.value]["urban"]
+    @lru_cache(maxsize=4096)
+    def _compute_urban(self, region: Region, year: int) -> UrbanData:
+        """Simulated urban expansion data for a region and year"""
+        region_id = region.value
+        rng = _seeded_rng("urban", region_id, year)
+        trend_config, region_factor = self._params[(region_id, "urban")]
         
         # Calculate cumulative urban area with growth
         years_from_2000 = year - 2000
-        cumulative_growth = sum([
-            trend_config["growth_rate"] * (1.01 ** y) 
-            for y in range(years_from_2000)
-        ])
+        cumulative_growth = _geometric_sum(trend_config["growth_rate"], 1.01, years_from_2000)
         
         urban_area = trend_config["initial_area"] + cumulative_growth * region_factor
         
         # Add yearly variation
-        variation_percent = random.uniform(
+        variation_percent = float(rng.uniform(
             -trend_config["variation_fraction"], 
             trend_config["variation_fraction"]
-        )
+        ))
         urban_area *= (1 + variation_percent)
         
         # Calculate built-up percentage based on region
-        region_info = get_region_info(region.value)
+        region_info = get_region_info(region_id)
         if region_info:
             total_area = region_info.area_km2
             built_up_percentage = (urban_area / total_area) * 100
@@ -242,20 +368,15 @@ class EnvironmentalDataSimulator:
             population_growth *= region_factor
             
             # Nightlight intensity correlates with urban density
-            nightlight_intensity = min(100, built_up_percentage * 1.2 + random.uniform(-10, 15))
+            nightlight_intensity = min(100, built_up_percentage * 1.2 + float(rng.uniform(-10, 15)))
         else:
             built_up_percentage = 15.0
             population_growth = 500000
             nightlight_intensity = 20.0
         
-        region_info = get_region_info(region.value)
-        if region_info:
-            boundary = get_region_boundary(region.value)
-            data_points = self._generate_spatial_data_points(
-                boundary, "urban", urban_area / 100, 0.25, year
-            )
-        else:
-            data_points = []
+        data_points = self._generate_spatial_data_points(
+            self.region_bboxes.get(region_id), "urban", urban_area / 100, 0.25, year, rng
+        )
         
         return UrbanData(
             year=year,
@@ -269,39 +390,36 @@ class EnvironmentalDataSimulator:
         trend="expanding"
         )
     
-    async def simulate_temperature_data(self, region: Region, year: int) -> TemperatureData:
-        """Simulate realistic temperature warming"""
-        await self._simulate_api_delay()
-        
-        trend_config = self.REAL_TRENDS["temperature"]
-        region_factor = self.region_adjustments[region.value]["temperature"]
+    @lru_cache(maxsize=4096)
+    def _compute_temperature(self, region: Region, year: int) -> TemperatureData:
+        """Simulated temperature data for a region and year"""
+        region_id = region.value
+        rng = _seeded_rng("temperature", region_id, year)
+        trend_config, region_factor = self._params[(region_id, "temperature")]
         
         # Calculate temperature with warming trend
         years_from_2000 = year - 2000
         base_temperature = trend_config["base_temp"] + (trend_config["warming_rate"] * years_from_2000)
         base_temperature *= region_factor
         
-        # Add realistic seasonal and yearly variation
-        yearly_variation = random.uniform(-trend_config["variation"], trend_config["variation"])
+        # Draw the yearly variation and the daily temperature range in one call
+        yearly_variation, temp_range = rng.uniform(
+            (-trend_config["variation"], 8),
+            (trend_config["variation"], 15)
+        ).tolist()
         avg_temp = base_temperature + yearly_variation
         
         # Calculate min/max temperatures
-        temp_range = random.uniform(8, 15)
-        min_temp = avg_temp - temp_range / 2
-        max_temp = avg_temp + temp_range / 2
+        half_range = temp_range / 2
+        min_temp = avg_temp - half_range
+        max_temp = avg_temp + half_range
         
         # Urban heat island effect
-        region_factor_val = self.region_adjustments[region.value]["temperature"]
-        heat_island = trend_config["urban_heat_island"] if region_factor_val > 1.2 else 0.2
+        heat_island = trend_config["urban_heat_island"] if region_factor > 1.2 else 0.2
         
-        region_info = get_region_info(region.value)
-        if region_info:
-            boundary = get_region_boundary(region.value)
-            data_points = self._generate_spatial_data_points(
-                boundary, "temperature", avg_temp, trend_config["variation"], year
-            )
-        else:
-            data_points = []
+        data_points = self._generate_spatial_data_points(
+            self.region_bboxes.get(region_id), "temperature", avg_temp, trend_config["variation"], year, rng
+        )
         
         return TemperatureData(
             year=year,
@@ -317,91 +435,104 @@ class EnvironmentalDataSimulator:
     
     def _generate_spatial_data_points(
         self, 
-        boundary: Optional[List[Tuple[float, float]]], 
+        bbox: Optional[Tuple[float, float, float, float]], 
         indicator_type: str, 
         base_value: float, 
         variation: float,
-        year: int
+        year: int,
+        rng: Optional[np.random.Generator] = None
     ) -> List[EnvironmentalDataPoint]:
         """Generate spatial data points across region"""
-        if not boundary or len(boundary) < 3:
+        batch = self._generate_spatial_data_points_soa(bbox, indicator_type, base_value, variation, year, rng)
+        if batch is None:
             return []
+        return batch.to_points()
+    
+    def _generate_spatial_data_points_soa(
+        self,
+        bbox: Optional[Tuple[float, float, float, float]],
+        indicator_type: str,
+        base_value: float,
+        variation: float,
+        year: int,
+        rng: Optional[np.random.Generator] = None
+    ) -> Optional[DataPointBatch]:
+        """Generate spatial data points across region as columns"""
+        # Only regions with a boundary have a bbox; the rest get no spatial samples
+        if bbox is None:
+            return None
+        if rng is None:
+            rng = self._rng
         
         # Generate sample points within region
-        data_points = []
-        num_points = random.randint(8, 25)
-        
-        # Get bounding box
-        min_lng = min(point[0] for point in boundary)
-        max_lng = max(point[0] for point in boundary)
-        min_lat = min(point[1] for point in boundary)
-        max_lat = max(point[1] for point in boundary)
-        
-        for _ in range(num_points):
-            # Generate random points within bounding box
-            longitude = random.uniform(min_lng, max_lng)
-            latitude = random.uniform(min_lat, max_lat)
-            
-            # Add realistic variation to base value
-            point_variation = random.uniform(-variation, variation)
-            point_value = base_value + point_variation
-            
-            # Ensure reasonable bounds for different indicators
-            if indicator_type == "ndvi":
-                point_value = max(-1, min(1, point_value))
-            elif indicator_type == "temperature":
-                point_value = max(-50, min(50, point_value))
-            elif indicator_type in ["glacier", "urban"]:
-                point_value = max(0, point_value)
-            
-            confidence = random.uniform(0.75, 0.98)  # Simulate data confidence
-            
-            data_points.append(EnvironmentalDataPoint(
-                longitude=longitude,
-                latitude=latitude,
-                value=round(point_value, 3),
-                confidence=round(confidence, 2),
-                timestamp=datetime(year, random.randint(6, 9), random.randint(1, 30))
-            ))
-        
-        return data_points
+        num_points = int(rng.integers(8, 26))
+        
+        min_lng, max_lng, min_lat, max_lat = bbox
+        
+        # Draw every coordinate, value, confidence and date in vectorized batches
+        longitudes = rng.uniform(min_lng, max_lng, num_points)
+        latitudes = rng.uniform(min_lat, max_lat, num_points)
+        values = base_value + rng.uniform(-variation, variation, num_points)
+        confidences = rng.uniform(0.75, 0.98, num_points)  # Simulate data confidence
+        months = rng.integers(6, 10, num_points)
+        days = rng.integers(1, 31, num_points)
+        
+        # Ensure reasonable bounds for different indicators
+        bounds = _POINT_VALUE_BOUNDS.get(indicator_type)
+        if bounds is not None:
+            values = _clip_values(values, *bounds)
+        
+        # June-September dates of the given year
+        timestamps = (
+            (np.datetime64(f"{year}-01", "M") + (months - 1)).astype("datetime64[D]") + (days - 1)
+        ).astype("datetime64[s]")
+        
+        return DataPointBatch(
+            longitude=longitudes,
+            latitude=latitudes,
+            value=np.round(values, 3),
+            confidence=np.round(confidences, 2),
+            timestamp=timestamps
+        )
     
     async def _simulate_api_delay(self):
         """Simulate realistic API response delays"""
-        if settings.SIMULATE_API_DELAY:
-            delay = random.uniform(
-                settings.API_DELAY_MS * 0.5, 
-                settings.API_DELAY_MS * 1.5
-            ) / 1000
-            await asyncio.sleep(delay)
+        if self._delay_bounds is not None:
+            await asyncio.sleep(float(self._rng.uniform(*self._delay_bounds)))
     
     def _process_real_ndvi_data(self, real_data: dict, region: Region, year: int) -> NDVIData:
         """Process real NASA MODIS NDVI data"""
         try:
-            # Extract data from NASA API response
-            ndvi_values = real_data.get('data', [])
-            if not ndvi_values:
+            # Extract the sample columns from the NASA API response
+            samples = real_data.get('data')
+            if not samples or not len(samples['value']):
                 raise ValueError("No NDVI data in NASA response")
             
-            # Calculate statistics
-            values = [point['value'] for point in ndvi_values]
-            avg_ndvi = sum(values) / len(values)
-            min_ndvi = min(values)
-            max_ndvi = max(values)
+            # Calculate statistics with array reductions
+            values = samples['value']
+            avg_ndvi = float(values.mean())
+            min_ndvi = float(values.min())
+            max_ndvi = float(values.max())
             
             # Calculate vegetation coverage
             vegetation_coverage = max(0, min(100, avg_ndvi * 85))
             
-            # Generate data points
+            # Every sample in a response shares the one timestamp
+            timestamp = datetime.fromisoformat(samples['timestamp'])
             data_points = [
-                EnvironmentalDataPoint(
-                    longitude=point['longitude'],
-                    latitude=point['latitude'],
-                    value=point['value'],
-                    confidence=point.get('confidence', 0.95),
-                    timestamp=point.get('timestamp', f"{year}-06-15T00:00:00Z")
+                EnvironmentalDataPoint.fast_from_row(
+                    longitude=longitude,
+                    latitude=latitude,
+                    value=value,
+                    confidence=confidence,
+                    timestamp=timestamp
+                )
+                for longitude, latitude, value, confidence in zip(
+                    samples['longitude'].tolist(),
+                    samples['latitude'].tolist(),
+                    values.tolist(),
+                    samples['confidence'].tolist()
                 )
-                for point in ndvi_values
             ]
             
             # Determine trend
@@ -426,25 +557,20 @@ class EnvironmentalDataSimulator:
     
     def _simulate_ndvi_data_fallback(self, region: Region, year: int) -> NDVIData:
         """Fallback NDVI simulation when real data fails"""
-        trend_config = self.REAL_TRENDS["ndvi"]
-        region_factor = self.region_adjustments[region.value]["ndvi"]
+        region_id = region.value
+        trend_config, region_factor = self._params[(region_id, "ndvi")]
         
         years_from_2000 = year - 2000
         base_value = trend_config["base_value"] + (trend_config["trend"] * years_from_2000)
         base_value *= region_factor
         
-        variation = random.uniform(-trend_config["variation"], trend_config["variation"])
+        variation = float(self._rng.uniform(-trend_config["variation"], trend_config["variation"]))
         avg_ndvi = max(0.0, min(1.0, base_value + variation))
-        vegetation_coverage = max(0, min(100, avg_ndvi * 85 + random.uniform(-5, 10)))
+        vegetation_coverage = max(0, min(100, avg_ndvi * 85 + float(self._rng.uniform(-5, 10))))
         
-        region_info = get_region_info(region.value)
-        if region_info:
-            boundary = get_region_boundary(region.value)
-            data_points = self._generate_spatial_data_points(
-                boundary, "ndvi", avg_ndvi, trend_config["variation"], year
-            )
-        else:
-            data_points = []
+        data_points = self._generate_spatial_data_points(
+            self.region_bboxes.get(region_id), "ndvi", avg_ndvi, trend_config["variation"], year
+        )
         
         trend = "increasing" if avg_ndvi > 0.6 else "stable"
         
@@ -463,12 +589,13 @@ class EnvironmentalDataSimulator:
     def get_trend_summary(self, indicator: DataIndicator, region: Region, start_year: int, end_year: int) -> str:
         """Generate human-readable trend summary"""
         years = end_year - start_year
+        region_name = region.value.replace('_', ' ').title()
         
         summaries = {
-            DataIndicator.NDVI: f"Vegetation health changed over {years} years in {region.value.replace('_', ' ').title()}",
-            DataIndicator.GLACIER: f"Glacier coverage retreated significantly over {years} years in {region.value.replace('_', ' ').title()}",
-            DataIndicator.URBAN: f"Urban areas expanded dramatically over {years} years in {region.value.replace('_', ' ').title()}",
-            DataIndicator.TEMPERATURE: f"Temperatures warmed consistently over {years} years in {region.value.replace('_', ' ').title()}"
+            DataIndicator.NDVI: f"Vegetation health changed over {years} years in {region_name}",
+            DataIndicator.GLACIER: f"Glacier coverage retreated significantly over {years} years in {region_name}",
+            DataIndicator.URBAN: f"Urban areas expanded dramatically over {years} years in {region_name}",
+            DataIndicator.TEMPERATURE: f"Temperatures warmed consistently over {years} years in {region_name}"
         }
         
         return summaries.get(indicator, "Environmental changes observed over time")
@@ -5,12 +5,70 @@ Provides integration with map tile services and geographic data
 
 import httpx
 import asyncio
-from typing import Dict, List, Optional, Tuple, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Final, List, Mapping, Optional, Tuple
 from app.config.settings import settings
 import logging
 
+from cachetools import LRUCache
+
+from app.config.settings import DATA_YEAR_MAX
+
 logger = logging.getLogger(__name__)
 
+# Tiles rendered at startup: zoom 0 through WARM_TILE_MAX_ZOOM of the latest year
+WARM_TILE_INDICATORS = ("ndvi", "glacier", "urban", "temperature")
+WARM_TILE_MAX_ZOOM = 1
+
+# Placeholder tile color per indicator
+_INDICATOR_COLORS: Final[Mapping[str, Tuple[int, int, int]]] = MappingProxyType({
+    "ndvi": (34, 139, 34),      # Green for vegetation
+    "glacier": (176, 224, 230), # Light blue for glaciers
+    "urban": (255, 165, 0),     # Orange for urban
+    "temperature": (255, 69, 0)  # Red for temperature
+})
+_DEFAULT_INDICATOR_COLOR = (128, 128, 128)  # Gray
+
+# Attribution per tile type, static and shared by every caller
+_ATTRIBUTIONS: Final[Mapping[str, Mapping[str, str]]] = MappingProxyType({
+    "satellite": MappingProxyType({
+        "attribution": "© Mapbox, © Maxar Technologies",
+        "license": "Mapbox Satellite Imagery License"
+    }),
+    "dark": MappingProxyType({
+        "attribution": "© OpenStreetMap contributors, © Mapbox",
+        "license": "Mapbox Design License"
+    }),
+    "light": MappingProxyType({
+        "attribution": "© OpenStreetMap contributors, © Mapbox", 
+        "license": "Mapbox Design License"
+    }),
+    "cartodb_dark": MappingProxyType({
+        "attribution": "© OpenStreetMap contributors, © CARTO",
+        "license": "ODbl"
+    })
+})
+_DEFAULT_ATTRIBUTION: Final[Mapping[str, str]] = MappingProxyType({
+    "attribution": "© OpenStreetMap contributors",
+    "license": "ODbl"
+})
+
+TILE_SIZE = 256
+_GRID_SPACING = 32
+
+@lru_cache(maxsize=1)
+def _grid_template():
+    """Transparent tile with the placeholder grid drawn once, pasted onto every tile"""
+    from PIL import Image, ImageDraw
+    
+    template = Image.new('RGBA', (TILE_SIZE, TILE_SIZE), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(template)
+    for i in range(0, TILE_SIZE, _GRID_SPACING):
+        draw.line([(i, 0), (i, TILE_SIZE)], fill=(255, 255, 255, 255), width=1)
+        draw.line([(0, i), (TILE_SIZE, i)], fill=(255, 255, 255, 255), width=1)
+    return template
+
 class MapService:
     """Map Services Integration for tiles and geographic data"""
     
@@ -20,39 +78,50 @@ class MapService:
         self.mapbox_style_url = settings.MAPBOX_STYLE_URL
         self.client = None
         self.is_initialized = False
+        # Rendered placeholder tiles; the bytes are immutable and shared
+        self._tile_cache: LRUCache = LRUCache(maxsize=1024)
     
     async def initialize(self):
         """Initialize map service client"""
         try:
-            # Initialize HTTP client for map services
+            await asyncio.to_thread(self._warm_tile_cache)
+        except Exception as e:
+            logger.warning(f"Tile cache warm-up skipped: {e}")
+        
+        try:
+            # Initialize HTTP client for map services; HTTP/2 and a warm pool
+            # let tile requests share connections instead of new TLS handshakes
             self.client = httpx.AsyncClient(
+                http2=True,
                 timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
                 headers={
                     "User-Agent": "Earth-Observation-Visualizer/1.0"
                 }
             )
             
-            # Verify map service availability
+            # Verify map service availability, probing every configured service at once
+            probes = []
             if self.mapbox_token != "your_mapbox_token_here":
                 # Test Mapbox service
-                response = await self.client.get(
+                probes.append(("Mapbox", self.client.get(
                     f"https://api.mapbox.com/styles/v1/mapbox/dark-v10/tiles/0/0/0?access_token={self.mapbox_token}"
-                )
-                if response.status_code == 200:
-                    logger.info("Mapbox service initialized successfully")
-                    self.is_initialized = True
-                else:
-                    logger.warning(f"Mapbox service test failed: {response.status_code}")
+                )))
             
             if self.cartodb_key != "your_cartodb_key_here":
                 # Test CartoDB service
                 base_url = "https://{s}.basemaps.cartocdn.com/dark_all"
-                response = await self.client.get(base_url.format(s="a") + "/0/0/0.png")
-                if response.status_code == 200:
-                    logger.info("CartoDB service initialized successfully")
+                probes.append(("CartoDB", self.client.get(base_url.format(s="a") + "/0/0/0.png")))
+            
+            results = await asyncio.gather(*(probe for _, probe in probes), return_exceptions=True)
+            for (name, _), response in zip(probes, results):
+                if isinstance(response, BaseException):
+                    logger.warning(f"{name} service test failed: {response}")
+                elif response.status_code == 200:
+                    logger.info(f"{name} service initialized successfully")
                     self.is_initialized = True
                 else:
-                    logger.warning(f"CartoDB service test failed: {response.status_code}")
+                    logger.warning(f"{name} service test failed: {response.status_code}")
             
             if not self.is_initialized:
                 logger.info("Map services not configured, using placeholder tiles")
@@ -127,32 +196,9 @@ class MapService:
             # Default to CartoDB dark theme
             return f"https://{{s}}.basemaps.cartocdn.com/dark_all/{z}/{x}/{y}.png"
     
-    async def get_attribution_info(self, tile_type: str) -> Dict[str, str]:
+    async def get_attribution_info(self, tile_type: str) -> Mapping[str, str]:
         """Get attribution information for map tiles"""
-        
-        attributions = {
-            "satellite": {
-                "attribution": "© Mapbox, © Maxar Technologies",
-                "license": "Mapbox Satellite Imagery License"
-            },
-            "dark": {
-                "attribution": "© OpenStreetMap contributors, © Mapbox",
-                "license": "Mapbox Design License"
-            },
-            "light": {
-                "attribution": "© OpenStreetMap contributors, © Mapbox", 
-                "license": "Mapbox Design License"
-            },
-            "cartodb_dark": {
-                "attribution": "© OpenStreetMap contributors, © CARTO",
-                "license": "ODbl"
-            }
-        }
-        
-        return attributions.get(tile_type, {
-            "attribution": "© OpenStreetMap contributors",
-            "license": "ODbl"
-        })
+        return _ATTRIBUTIONS.get(tile_type, _DEFAULT_ATTRIBUTION)
     
     async def _generate_placeholder_tile(
         self,
@@ -163,25 +209,44 @@ class MapService:
         y: int
     ) -> bytes:
         """Generate placeholder tile for environmental data"""
+        key = (indicator, year, z, x, y)
+        tile = self._tile_cache.get(key)
+        if tile is None:
+            # PIL drawing and PNG encoding are CPU-bound, keep them off the event loop
+            tile = await asyncio.to_thread(self._render_tile_sync, indicator, year, z, x, y)
+            self._tile_cache[key] = tile
+        return tile
+    
+    def _warm_tile_cache(self):
+        """Render the low-zoom tiles of the latest year for every indicator"""
+        for indicator in WARM_TILE_INDICATORS:
+            for z in range(WARM_TILE_MAX_ZOOM + 1):
+                for x in range(2 ** z):
+                    for y in range(2 ** z):
+                        key = (indicator, DATA_YEAR_MAX, z, x, y)
+                        self._tile_cache[key] = self._render_tile_sync(*key)
+    
+    def _render_tile_sync(
+        self,
+        indicator: str,
+        year: int,
+        z: int,
+        x: int,
+        y: int
+    ) -> bytes:
+        """Render a placeholder tile to PNG bytes"""
         
         # Generate simple colored tile based on indicator
         import io
         from PIL import Image, ImageDraw
         
         # Create 256x256 tile
-        size = 256
-        image = Image.new('RGB', (size, size), color=self._get_indicator_color(indicator))
-        draw = ImageDraw.Draw(image)
+        image = Image.new('RGB', (TILE_SIZE, TILE_SIZE), color=self._get_indicator_color(indicator))
         
         # Add grid overlay to simulate data points
-        grid_size = 32
-        opacity = Image.new('RGB', (size, size), (0, 0, 0, 50))
-        
-        # Draw grid
-        for i in range(0, size, grid_size):
-            draw.line([(i, 0), (i, size)], fill=(255, 255, 255, 100), width=1)
-        for i in range(0, size, grid_size):
-            draw.line([(0, i), (size, i)], fill=(255, 255, 255, 100), width=1)
+        grid = _grid_template()
+        image.paste(grid, (0, 0), grid)
+        draw = ImageDraw.Draw(image)
         
         # Add indicator text
         try:
@@ -192,24 +257,19 @@ class MapService:
         except:
             pass
         
-        # Convert to bytes
-        img_byte_arr = io.BytesIO()
-        image.save(img_byte_arr, format='PNG')
-        img_byte_arr.seek(0)
-        
-        return img_byte_arr.getvalue()
+        # Convert to bytes; flat placeholder art compresses well even at the
+        # fastest zlib level, which is several times cheaper to encode
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG', compress_level=1)
+        return buffer.getvalue()
     
     def _get_indicator_color(self, indicator: str) -> Tuple[int, int, int]:
         """Get color for environmental indicator"""
-        
-        colors = {
-            "ndvi": (34, 139, 34),      # Green for vegetation
-            "glacier": (176, 224, 230), # Light blue for glaciers
-            "urban": (255, 165, 0),     # Orange for urban
-            "temperature": (255, 69, 0)  # Red for temperature
-        }
-        
-        return colors.get(indicator.lower(), (128, 128, 128))  # Gray default
+        # Indicators normally arrive lowercase; only lowercase on a miss
+        color = _INDICATOR_COLORS.get(indicator)
+        if color is None:
+            color = _INDICATOR_COLORS.get(indicator.lower(), _DEFAULT_INDICATOR_COLOR)
+        return color
     
     async def get_service_status(self) -> Dict[str, Any]:
         """Get map service status"""
@@ -5,52 +5,140 @@ Provides integration with real NASA Earth Observation APIs when configured
 
 import httpx
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import Dict, Final, List, Optional, Any, Tuple
 from app.config.settings import settings
+from app.services.cache import cache_service
+from app.utils.helpers import create_cache_configuration, generate_cache_key
 import logging
+import numpy as np
+import orjson
 
 logger = logging.getLogger(__name__)
 
+CMR_COLLECTIONS_URL: Final = "https://cmr.earthdata.nasa.gov/search/collections"
+CMR_GRANULES_URL: Final = "https://cmr.earthdata.nasa.gov/search/granules"
+
+# Product endpoints under the configured Earth Observation API base URL,
+# built once instead of per request
+LANDSAT_URBAN_URL: Final = f"{settings.NASA_EO_BASE_URL}/landsat/urban"
+MODIS_LST_URL: Final = f"{settings.NASA_EO_BASE_URL}/modis/lst"
+SENTINEL_GLACIER_URL: Final = f"{settings.NASA_EO_BASE_URL}/sentinel/glacier"
+
+# MODIS Vegetation Indices (short_name, version)
+MODIS_NDVI_COLLECTION = ("MOD13Q1", "061")
+
+# Upper bound in seconds on any single NASA request
+REQUEST_TIMEOUT = 30.0
+
+# CMR search results change on a daily-to-weekly cadence
+CMR_CACHE_TTL = create_cache_configuration()["environmental_data_ttl"]
+
+# Granules requested per CMR search. Pages stay at a few kilobytes, so a
+# listing is decoded in one orjson call (and cached as raw bytes) rather
+# than parsed incrementally off the socket
+GRANULE_PAGE_SIZE = 10
+
+# Synthetic MODIS sample points: count per granule, center, and NDVI range per region
+POINTS_PER_GRANULE = 5
+_NEPAL_CENTER_LAT = 27.7172
+_NEPAL_CENTER_LON = 85.3240
+_NDVI_RANGES = {
+    "kathmandu_valley": (0.3, 0.6),  # Urban area
+    "annapurna_region": (0.4, 0.8),  # Mountain vegetation
+    "everest_region": (0.1, 0.4),  # High altitude
+}
+_DEFAULT_NDVI_RANGE = (0.4, 0.7)  # General Nepal
+_RNG = np.random.default_rng()
+
+# msgspec is optional: when installed, granule listings are decoded straight
+# into a schema holding only the fields read here, skipping everything else
+try:
+    import msgspec
+except ImportError:
+    _decode_granule_feed = None
+else:
+    class _GranuleEntry(msgspec.Struct):
+        polygons: Optional[list] = None
+    
+    class _GranuleEntries(msgspec.Struct):
+        entry: List[_GranuleEntry] = []
+    
+    class _GranuleFeed(msgspec.Struct):
+        feed: _GranuleEntries = msgspec.field(default_factory=_GranuleEntries)
+    
+    _decode_granule_feed = msgspec.json.Decoder(_GranuleFeed).decode
+
+def _count_covered_granules(body: bytes) -> int:
+    """Number of granules in a CMR listing that carry spatial polygons"""
+    if _decode_granule_feed is not None:
+        return sum(1 for entry in _decode_granule_feed(body).feed.entry if entry.polygons)
+    entries = orjson.loads(body).get('feed', {}).get('entry', [])
+    return sum(1 for entry in entries if entry.get('polygons'))
+
+# Process-wide HTTP client shared by every NASA request, so connections
+# (and their TLS sessions) to CMR are pooled and multiplexed over HTTP/2
+_client: Optional[httpx.AsyncClient] = None
+
+async def get_client() -> httpx.AsyncClient:
+    """Return the shared NASA HTTP client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            # No Accept-Encoding here: httpx advertises every decoder it has
+            # (gzip and deflate, plus br via the brotli extra) and decodes the
+            # body itself, so listing one it lacks would break responses
+            headers={
+                "Content-Type": "application/json",
+                "User-Agent": "Earth-Observation-Visualizer/1.0"
+            }
+        )
+    return _client
+
+async def close_client():
+    """Close the shared NASA HTTP client"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 class NASAEOClient:
     """NASA Earth Observation API Client"""
     
     def __init__(self):
         self.api_key = settings.NASA_API_KEY
         self.base_url = settings.NASA_EO_BASE_URL
-        self.client = None
+        self.client_ready = False
         self.is_initialized = False
+        self._auth_headers: Dict[str, str] = {}
+        # CMR collection concept ids by (short_name, version); they never change
+        self._collection_cache: Dict[Tuple[str, str], str] = {}
     
     async def initialize(self):
         """Initialize NASA API client with real Earthdata token"""
         try:
+            # Public CMR search works without a token, so the shared client is
+            # opened either way; the token only adds an Authorization header
+            await get_client()
+            self.client_ready = True
+            
             if not self.api_key or self.api_key.strip() == "your_nasa_api_key_here":
                 logger.info("NASA API key not configured, using mock data")
-                # Still create a client for unauthenticated endpoints like CMR public search
-                self.client = httpx.AsyncClient(
-                    timeout=30.0,
-                    headers={
-                        "Content-Type": "application/json",
-                        "User-Agent": "Earth-Observation-Visualizer/1.0"
-                    }
-                )
+                self._auth_headers = {}
                 self.is_initialized = False
+                await self._prefetch_collections()
                 return
 
-            # Initialize with NASA Earthdata Bearer Token
-            self.client = httpx.AsyncClient(
-                timeout=30.0,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                    "User-Agent": "Earth-Observation-Visualizer/1.0"
-                }
-            )
+            # Authenticate with NASA Earthdata Bearer Token
+            self._auth_headers = {"Authorization": f"Bearer {self.api_key}"}
             
             # Test connection to NASA Earthdata CMR (Common Metadata Repository)
-            test_url = "https://cmr.earthdata.nasa.gov/search/collections"
-            response = await self.client.get(test_url, params={"page_size": 1})
+            response = await self._get(CMR_COLLECTIONS_URL, params={"page_size": 1})
             response.raise_for_status()
             self.is_initialized = True
+            await self._prefetch_collections()
             logger.info("✅ NASA Earthdata API initialized successfully with real token")
             logger.info("🛰️ Connected to NASA Earth Observation data services")
         except Exception as e:
@@ -58,45 +146,81 @@ class NASAEOClient:
             # keep client but mark not initialized
             self.is_initialized = False
     
+    async def _get(self, url: str, params: Dict[str, Any]) -> httpx.Response:
+        """GET through the shared client, bounded by the request budget"""
+        client = _client
+        if client is None or client.is_closed:
+            client = await get_client()
+        return await asyncio.wait_for(
+            client.get(url, params=params, headers=self._auth_headers),
+            REQUEST_TIMEOUT
+        )
+    
+    async def _cached_get_bytes(self, url: str, params: Dict[str, Any], ttl: int = CMR_CACHE_TTL) -> bytes:
+        """GET a response body, served from the response cache for `ttl` seconds"""
+        key = f"cmr:{generate_cache_key(url, *sorted(params.items()))}"
+        body = await cache_service.get(key)
+        if body is None:
+            response = await self._get(url, params=params)
+            response.raise_for_status()
+            body = response.content
+            await cache_service.set(key, body, ttl)
+        return body
+    
+    async def _cached_get(self, url: str, params: Dict[str, Any], ttl: int = CMR_CACHE_TTL) -> Any:
+        """GET a JSON document, served from the response cache for `ttl` seconds"""
+        return orjson.loads(await self._cached_get_bytes(url, params, ttl))
+    
+    async def _collection_concept_id(self, short_name: str, version: str) -> Optional[str]:
+        """Resolve a CMR collection concept id, searching CMR only the first time"""
+        key = (short_name, version)
+        concept_id = self._collection_cache.get(key)
+        if concept_id is not None:
+            return concept_id
+        
+        collections = await self._cached_get(
+            CMR_COLLECTIONS_URL,
+            params={"short_name": short_name, "version": version, "page_size": 1}
+        )
+        entries = collections.get('feed', {}).get('entry')
+        if not entries:
+            return None
+        
+        concept_id = self._collection_cache[key] = entries[0]['id']
+        return concept_id
+    
+    async def _prefetch_collections(self):
+        """Resolve the collections used on the hot path at startup"""
+        try:
+            await self._collection_concept_id(*MODIS_NDVI_COLLECTION)
+        except Exception as e:
+            logger.warning(f"MODIS collection lookup deferred: {e}")
+    
     async def fetch_modis_ndvi(self, region: str, year: int) -> Optional[Dict]:
         """Fetch MODIS NDVI data from NASA CMR"""
         
-        if not self.client:
+        if not self.client_ready:
             logger.warning("NASA HTTP client not available, returning mock data")
             return None
         
         try:
-            # Search for MODIS NDVI collections
-            cmr_url = "https://cmr.earthdata.nasa.gov/search/collections"
-            params = {
-                "short_name": "MOD13Q1",  # MODIS Vegetation Indices
-                "version": "061",
-                "page_size": 1
-            }
-            
-            response = await self.client.get(cmr_url, params=params)
-            response.raise_for_status()
-            
-            collections = response.json()
-            if not collections.get('feed', {}).get('entry'):
+            # Resolve the MODIS NDVI collection (cached after the first search)
+            collection_id = await self._collection_concept_id(*MODIS_NDVI_COLLECTION)
+            if collection_id is None:
                 logger.warning("No MODIS NDVI collections found")
                 return None
             
             # Get granules for specific year and region
-            granules_url = "https://cmr.earthdata.nasa.gov/search/granules"
             granule_params = {
-                "collection_concept_id": collections['feed']['entry'][0]['id'],
+                "collection_concept_id": collection_id,
                 "temporal": f"{year}-01-01T00:00:00Z,{year}-12-31T23:59:59Z",
-                "page_size": 10
+                "page_size": GRANULE_PAGE_SIZE
             }
             
-            granule_response = await self.client.get(granules_url, params=granule_params)
-            granule_response.raise_for_status()
-            
-            granules = granule_response.json()
+            granules = await self._cached_get_bytes(CMR_GRANULES_URL, params=granule_params)
             
             # Process granules and return data
-            processed_data = self._process_modis_granules(granules, region, year)
+            processed_data = self._process_modis_granules(_count_covered_granules(granules), region, year)
             
             if processed_data:
                 logger.info(f"✅ Successfully fetched MODIS NDVI data for {region} in {year}")
@@ -117,13 +241,13 @@ class NASAEOClient:
     async def fetch_landsat_urban(self, region: str, year: int) -> Optional[Dict]:
         """Fetch Landsat urban data from NASA"""
         
-        if not self.is_initialized or not self.client:
+        if not self.is_initialized or not self.client_ready:
             logger.warning("NASA API not initialized, returning mock data")
             return None
         
         try:
             # TODO: Implement real Landsat urban classification API call
-            endpoint = f"{self.base_url}/landsat/urban"
+            endpoint = LANDSAT_URBAN_URL
             params = {
                 "region": region,
                 "year": year,
@@ -131,10 +255,10 @@ class NASAEOClient:
                 "algorithm": "mlc"
             }
             
-            response = await self.client.get(endpoint, params=params)
+            response = await self._get(endpoint, params=params)
             response.raise_for_status()
             
-            return response.json()
+            return orjson.loads(response.content)
             
         except Exception as e:
             logger.error(f"Failed to fetch Landsat urban data: {e}")
@@ -143,13 +267,13 @@ class NASAEOClient:
     async def fetch_modis_lst(self, region: str, year: int) -> Optional[Dict]:
         """Fetch MODIS Land Surface Temperature data from NASA"""
         
-        if not self.is_initialized or not self.client:
+        if not self.is_initialized or not self.client_ready:
             logger.warning("NASA API not initialized, returning mock data")
             return None
         
         try:
             # TODO: Implement real MODIS LST API call
-            endpoint = f"{self.base_url}/modis/lst"
+            endpoint = MODIS_LST_URL
             params = {
                 "region": region,
                 "year": year,
@@ -157,10 +281,10 @@ class NASAEOClient:
                 "resolution": "1km"
             }
             
-            response = await self.client.get(endpoint, params=params)
+            response = await self._get(endpoint, params=params)
             response.raise_for_status()
             
-            return response.json()
+            return orjson.loads(response.content)
             
         except Exception as e:
             logger.error(f"Failed to fetch MODIS LST data: {e}")
@@ -169,13 +293,13 @@ class NASAEOClient:
     async def fetch_sentinel_glacier(self, region: str, year: int) -> Optional[Dict]:
         """Fetch Sentinel glacier data from NASA"""
         
-        if not self.is_initialized or not self.client:
+        if not self.is_initialized or not self.client_ready:
             logger.warning("NASA API not initialized, returning mock data")
             return None
         
         try:
             # TODO: Implement real Sentinel glacier tracking API call
-            endpoint = f"{self.base_url}/sentinel/glacier"
+            endpoint = SENTINEL_GLACIER_URL
             params = {
                 "region": region,
                 "year": year,
@@ -183,10 +307,10 @@ class NASAEOClient:
                 "algorithm": "deep_learning"
             }
             
-            response = await self.client.get(endpoint, params=params)
+            response = await self._get(endpoint, params=params)
             response.raise_for_status()
             
-            return response.json()
+            return orjson.loads(response.content)
             
         except Exception as e:
             logger.error(f"Failed to fetch Sentinel glacier data: {e}")
@@ -200,7 +324,7 @@ class NASAEOClient:
                 "# status": "not_initialized",
                 "api_key_configured": self.api_key != "your_nasa_api_key_here",
                 "base_url": self.base_url,
-                "client_initialized": self.client is not None,
+                "client_initialized": self.client_ready,
                 "error": "NASA API not initialized"
             }
         
@@ -208,7 +332,7 @@ class NASAEOClient:
             "status": "initialized",
             "api_key_configured": self.api_key != "your_nasa_api_key_here",
             "base_url": self.base_url,
-            "client_initialized": self.client is not None,
+            "client_initialized": self.client_ready,
             "endpoints_available": [
                 "modis/ndvi",
                 "landsat/urban", 
@@ -217,55 +341,43 @@ class NASAEOClient:
             ]
         }
     
-    def _process_modis_granules(self, granules: dict, region: str, year: int) -> List[Dict]:
-        """Process MODIS granules and extract NDVI data points"""
+    def _process_modis_granules(self, covered: int, region: str, year: int) -> Optional[Dict[str, Any]]:
+        """Process MODIS granules into NDVI sample columns (one array per field)"""
         try:
-            data_points = []
-            entries = granules.get('feed', {}).get('entry', [])
+            # Granules with spatial coordinates each contribute 5 sample
+            # points around the Nepal center, all drawn in one batch
+            n = POINTS_PER_GRANULE * covered
+            if n == 0:
+                return None
             
-            for entry in entries:
-                # Extract spatial coordinates
-                polygons = entry.get('polygons', [])
-                if polygons:
-                    # Get center coordinates for Nepal region
-                    center_lat = 27.7172  # Nepal center
-                    center_lon = 85.3240
-                    
-                    # Generate sample data points around Nepal
-                    import random
-                    for _ in range(5):  # Generate 5 data points per granule
-                        lat = center_lat + random.uniform(-2, 2)
-                        lon = center_lon + random.uniform(-2, 2)
-                        
-                        # Simulate NDVI value based on region
-                        if region == "kathmandu_valley":
-                            ndvi_value = random.uniform(0.3, 0.6)  # Urban area
-                        elif region == "annapurna_region":
-                            ndvi_value = random.uniform(0.4, 0.8)  # Mountain vegetation
-                        elif region == "everest_region":
-                            ndvi_value = random.uniform(0.1, 0.4)  # High altitude
-                        else:
-                            ndvi_value = random.uniform(0.4, 0.7)  # General Nepal
-                        
-                        data_points.append({
-                            "longitude": lon,
-                            "latitude": lat,
-                            "value": ndvi_value,
-                            "confidence": random.uniform(0.8, 0.95),
-                            "timestamp": f"{year}-06-15T00:00:00Z"
-                        })
+            # Simulate NDVI value based on region
+            low, high = _NDVI_RANGES.get(region, _DEFAULT_NDVI_RANGE)
+            timestamp = f"{year}-06-15T00:00:00Z"
             
-            return data_points
+            # One draw for every column: (latitude, longitude, value, confidence)
+            samples = _RNG.uniform(
+                (_NEPAL_CENTER_LAT - 2, _NEPAL_CENTER_LON - 2, low, 0.8),
+                (_NEPAL_CENTER_LAT + 2, _NEPAL_CENTER_LON + 2, high, 0.95),
+                size=(n, 4)
+            )
+            
+            return {
+                "longitude": samples[:, 1],
+                "latitude": samples[:, 0],
+                "value": samples[:, 2],
+                "confidence": samples[:, 3],
+                "timestamp": timestamp
+            }
             
         except Exception as e:
             logger.error(f"Failed to process MODIS granules: {e}")
-            return []
+            return None
 
     async def close(self):
         """Close NASA API client"""
-        if self.client:
-            await self.client.aclose()
-            self.client = None
+        if self.client_ready:
+            await close_client()
+            self.client_ready = False
             self.is_initialized = False
 
 # Global NASA client instance
@@ -0,0 +1,30 @@
+"""
+Request hot-path helpers for Earth Observation Visualizer
+Strictly typed so the module can be compiled with mypyc (`mypyc app/utils/_fastpath.py`);
+it runs unchanged as plain Python when no compiled build is present
+"""
+
+from typing import Tuple
+
+def split_year_range(value: str) -> Tuple[int, int]:
+    """Split a 'YYYY-YYYY' string into its start and end years"""
+    start, end = value.split("-")
+    return int(start), int(end)
+
+def sample_years(start_year: int, end_year: int, step: int = 5) -> Tuple[int, ...]:
+    """Every `step`-th year from start_year, always ending on end_year"""
+    years = list(range(start_year, end_year + 1, step))
+    if years[-1] != end_year:
+        years.append(end_year)
+    return tuple(years)
+
+def comparison_metrics(baseline_value: float, comparison_value: float) -> Tuple[float, float, float, float]:
+    """Rounded baseline, comparison, absolute change and percentage change"""
+    change_amount = comparison_value - baseline_value
+    change_percentage = (change_amount / baseline_value * 100) if baseline_value != 0 else 0.0
+    return (
+        round(baseline_value, 3),
+        round(comparison_value, 3),
+        round(change_amount, 3),
+        round(change_percentage, 2)
+    )
@@ -4,15 +4,74 @@ Common functions, data processing, and utilities
 """
 
 import hashlib
-import json
+import re
+from bisect import bisect_left
+from types import MappingProxyType
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
-import math
+from math import atan2, cos, radians, sin, sqrt
+
+import numpy as np
+import orjson
+
+# Bumped whenever the key derivation changes, so entries written under the
+# old scheme are missed instead of misread
+KEY_VERSION = "v2"
+
+EARTH_RADIUS_KM = 6371.0
+
+# \Z rather than $ so a trailing newline can't slip through
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\Z')
+
+# Key fragments that mark a value as sensitive, matched in one regex scan
+_SENSITIVE_KEYS = ("api_key", "token", "password", "secret")
+_SENSITIVE_KEY_RE = re.compile("|".join(map(re.escape, _SENSITIVE_KEYS)), re.IGNORECASE)
+
+# Lookup tables for the display helpers, built once at import
+_TREND_SYMBOLS = MappingProxyType({
+    "increasing": "↗",
+    "decreasing": "↘", 
+    "stable": "→",
+    "expanding": "↗",
+    "contracting": "↘",
+    "warming": "↗",
+    "cooling": "↘",
+    "rising": "↗",
+    "falling": "↘", 
+    "none": "-"
+})
+
+# indicator -> (trend keyword, color when the trend mentions it, color otherwise)
+_TREND_COLORS = MappingProxyType({
+    "ndvi": ("increasing", "green", "red"),
+    "vegetation": ("increasing", "green", "red"),
+    "glacier": ("decreasing", "red", "green"),
+    "urban": ("expanding", "orange", "blue"),
+    "built_up": ("expanding", "orange", "blue"),
+    "temperature": ("warming", "red", "blue")
+})
+
+_INDICATOR_NAMES = MappingProxyType({
+    "ndvi": "Vegetation Index",
+    "glacier": "Glacier Coverage", 
+    "urban": "Urban Expansion",
+    "temperature": "Surface Temperature"
+})
+
+_REGION_NAMES = MappingProxyType({
+    "nepal_himalayas": "Nepal Himalayas",
+    "kathmandu_valley": "Kathmandu Valley",
+    "annapurna_region": "Annapurna Region", 
+    "everest_region": "Everest Region"
+})
 
 def generate_cache_key(*args: Any) -> str:
     """Generate cache key from arguments"""
-    key_string = "_".join(str(arg) for arg in args)
-    return hashlib.md5(key_string.encode()).hexdigest()
+    digest = hashlib.blake2b(digest_size=16)
+    for arg in args:
+        digest.update(str(arg).encode())
+        digest.update(b"\x00")
+    return f"{KEY_VERSION}:{digest.hexdigest()}"
 
 def validate_year(year: int, min_year: int = 2000, max_year: int = 2025) -> bool:
     """Validate year is within supported range"""
@@ -29,20 +88,30 @@ def interpolate_value(value1: float, value2: float, ratio: float) -> float:
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Calculate distance between two coordinates using Haversine formula"""
     
-    R = 6371  # Earth's radius in kilometers
+    lat1_rad = radians(lat1)
+    lat2_rad = radians(lat2)
+    
+    sin_dlat = sin((lat2_rad - lat1_rad) * 0.5)
+    sin_dlon = sin(radians(lon2 - lon1) * 0.5)
+    
+    a = sin_dlat * sin_dlat + cos(lat1_rad) * cos(lat2_rad) * sin_dlon * sin_dlon
+    # atan2 stays accurate for near-antipodal points, where asin(sqrt(a)) loses precision
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    
+    return EARTH_RADIUS_KM * c
+
+def calculate_distance_batch(lat1: Any, lon1: Any, lat2: Any, lon2: Any) -> np.ndarray:
+    """Haversine distances in kilometers between arrays of coordinates (broadcasts like NumPy)"""
     
-    lat1_rad = math.radians(lat1)
-    lon1_rad = math.radians(lon1)
-    lat2_rad = math.radians(lat2)
-    lon2_rad = math.radians(lon2)
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
     
     dlat = lat2_rad - lat1_rad
-    dlon = lon2_rad - lon1_rad
+    dlon = np.radians(np.subtract(lon2, lon1))
     
-    a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
-    c = 2 * math.asin(math.sqrt(a))
+    a = np.sin(dlat * 0.5)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon * 0.5)**2
     
-    return R * c
+    return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(a))
 
 def normalize_ndvi(ndvi: float) -> float:
     """Normalize NDVI value to 0-1 range"""
@@ -78,38 +147,17 @@ def format_large_number(value: int) -> str:
 
 def get_trend_symbol(trend: str) -> str:
     """Get visual symbol for trend direction"""
-    
-    symbols = {
-        "increasing": "↗",
-        "decreasing": "↘", 
-        "stable": "→",
-        "expanding": "↗",
-        "contracting": "↘",
-        "warming": "↗",
-        "cooling": "↘",
-        "rising": "↗",
-        "falling": "↘", 
-        "none": "-"
-    }
-    
-    return symbols.get(trend.lower(), "→")
+    return _TREND_SYMBOLS.get(trend.lower(), "→")
 
 def get_trend_color(trend: str, indicator: str) -> str:
     """Get color for trend visualization"""
     
-    trend_lower = trend.lower()
-    
     # Different colors based on indicator type
-    if indicator in ["ndvi", "vegetation"]:
-        return "green" if "increasing" in trend_lower else "red"
-    elif indicator in ["glacier"]:
-        return "red" if "decreasing" in trend_lower else "green"
-    elif indicator in ["urban", "built_up"]:
-        return "orange" if "expanding" in trend_lower else "blue"
-    elif indicator in ["temperature"]:
-        return "red" if "warming" in trend_lower else "blue"
-    else:
+    rule = _TREND_COLORS.get(indicator)
+    if rule is None:
         return "gray"
+    keyword, matched, otherwise = rule
+    return matched if keyword in trend.lower() else otherwise
 
 def create_summary_statistics(values: List[float]) -> Dict[str, float]:
     """Create summary statistics from list of values"""
@@ -117,26 +165,37 @@ def create_summary_statistics(values: List[float]) -> Dict[str, float]:
     if not values:
         return {}
     
-    sorted_values = sorted(values)
     n = len(values)
+    arr = np.fromiter(values, dtype=np.float64, count=n)
+    minimum = float(arr.min())
+    maximum = float(arr.max())
+    
+    # The array is ours, so select the middle element(s) in place rather
+    # than letting np.median partition a copy
+    half = n // 2
+    if n % 2:
+        arr.partition(half)
+        median = float(arr[half])
+    else:
+        arr.partition((half - 1, half))
+        median = float(arr[half - 1:half + 1].mean())
     
     return {
-        "mean": sum(values) / n,
-        "median": sorted_values[n//2] if n % 2 == 0 else (sorted_values[n//2] + sorted_values[n//2 + 1]) / 2,
-        "min": min(values),
-        "max": max(values),
-        "range": max(values) - min(values),
-        "std_dev": math.sqrt(sum((x - sum(values)/n)**2 for x in values) / n) if n > 0 else 0
+        "mean": float(arr.mean()),
+        "median": median,
+        "min": minimum,
+        "max": maximum,
+        "range": maximum - minimum,
+        "std_dev": float(arr.std())
     }
 
 def mask_sensitive_data(data: Dict[str, Any]) -> Dict[str, Any]:
     """Mask sensitive data in environment variables"""
     
-    sensitive_keys = ["api_key", "token", "password", "secret"]
     masked_data = data.copy()
     
     for key, value in masked_data.items():
-        if any(sensitive in key.lower() for sensitive in sensitive_keys):
+        if _SENSITIVE_KEY_RE.search(key):
             if isinstance(value, str) and len(value) > 8:
                 masked_data[key] = value[:4] + "*" * (len(value) - 8) + value[-4:]
             else:
@@ -150,24 +209,24 @@ def generate_file_timestamp() -> str:
 
 def validate_email(email: str) -> bool:
     """Simple email validation"""
-    import re
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
-def safe_json_serializer(obj: Any) -> str:
-    """Safe JSON serializer that handles various data types"""
+def _json_default(obj: Any) -> Any:
+    """orjson fallback for types it doesn't serialize natively"""
     
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    elif isinstance(obj, set):
+    if isinstance(obj, (set, frozenset)):
         return list(obj)
-    elif hasattr(obj, 'dict'):  # Pydantic models
-        return obj.dict()
+    elif hasattr(obj, 'model_dump'):  # Pydantic models
+        return obj.model_dump()
     elif hasattr(obj, '__iter__') and not isinstance(obj, (str, bytes)):
         return list(obj)
     else:
         return str(obj)
 
+def safe_json_serializer(obj: Any) -> str:
+    """Serialize to JSON text, handling datetimes, NumPy arrays, models and other types"""
+    return orjson.dumps(obj, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
 def create_data_validation_summary(
     data_count: int,
     completeness: float,
@@ -190,14 +249,16 @@ def extract_coordinate_bounds(coordinates: List[Tuple[float, float]]) -> Dict[st
     if not coordinates:
         return {}
     
-    lats = [coord[1] for coord in coordinates]
-    lons = [coord[0] for coord in coordinates]
+    # (longitude, latitude) pairs, reduced column-wise in one pass each
+    arr = np.asarray(coordinates, dtype=np.float64)
+    min_longitude, min_latitude = arr.min(axis=0).tolist()
+    max_longitude, max_latitude = arr.max(axis=0).tolist()
     
     return {
-        "min_longitude": min(lons),
-        "min_latitude": min(lats),
-        "max_longitude": max(lons),
-        "max_latitude": max(lats)
+        "min_longitude": min_longitude,
+        "min_latitude": min_latitude,
+        "max_longitude": max_longitude,
+        "max_latitude": max_latitude
     }
 
 def time_series_interpolation(
@@ -207,17 +268,22 @@ def time_series_interpolation(
 ) -> Optional[float]:
     """Interpolate time series value at target time"""
     
-    if len(values) != len(timestamps) or len(values) == 0:
+    # A single sample has no interval to interpolate within
+    if len(values) != len(timestamps) or len(values) < 2:
         return None
     
-    # Find surrounding data points
-    for i in range(len(timestamps) - 1):
-        if timestamps[i] <= target_time <= timestamps[i + 1]:
-            # Linear interpolation
-            ratio = (target_time - timestamps[i]).total_seconds() / (timestamps[i + 1] - timestamps[i]).total_seconds()
-            return interpolate_value(values[i], values[i + 1], ratio)
+    # Find surrounding data points; timestamps are in ascending order
+    i = bisect_left(timestamps, target_time)
+    if i == len(timestamps):
+        return None
+    if timestamps[i] == target_time:
+        return values[i]
+    if i == 0:
+        return None
     
-    return None
+    # Linear interpolation
+    ratio = (target_time - timestamps[i - 1]).total_seconds() / (timestamps[i] - timestamps[i - 1]).total_seconds()
+    return interpolate_value(values[i - 1], values[i], ratio)
 
 def create_cache_configuration() -> Dict[str, Any]:
     """Create cache configuration for environment data"""
@@ -237,24 +303,8 @@ def create_cache_configuration() -> Dict[str, Any]:
 # Common data transformations
 def transform_indicator_name(indicator: str) -> str:
     """Transform indicator identifier to display name"""
-    
-    transformations = {
-        "ndvi": "Vegetation Index",
-        "glacier": "Glacier Coverage", 
-        "urban": "Urban Expansion",
-        "temperature": "Surface Temperature"
-    }
-    
-    return transformations.get(indicator.lower(), indicator.title())
+    return _INDICATOR_NAMES.get(indicator.lower(), indicator.title())
 
 def transform_region_name(region: str) -> str:
     """Transform region identifier to display name"""
-    
-    transformations = {
-        "nepal_himalayas": "Nepal Himalayas",
-        "kathmandu_valley": "Kathmandu Valley",
-        "annapurna_region": "Annapurna Region", 
-        "everest_region": "Everest Region"
-    }
-    
-    return transformations.get(region.lower(), region.replace('_', ' ').title())
+    return _REGION_NAMES.get(region.lower(), region.replace('_', ' ').title())
@@ -3,7 +3,6 @@ Development Server Runner for Earth Observation Visualizer Backend
 """
 
 import sys
-import subprocess
 import os
 from pathlib import Path
 
@@ -57,14 +56,23 @@ def start_server():
     print("🛡️  Running in development mode with mock data\n")
     
     try:
-        subprocess.run([
-            sys.executable, "-m", "uvicorn", 
-            "app.main:app", 
-            "--reload", 
-            "--host", "0.0.0.0", 
-            "--port", "8000",
-            "--log-level", "info"
-        ], check=True)
+        # Run uvicorn here instead of spawning `python -m uvicorn`; uvloop and
+        # httptools come with uvicorn[standard], except uvloop on Windows
+        import uvicorn
+        try:
+            import uvloop
+            loop = "uvloop"
+        except ImportError:
+            loop = "auto"
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            loop=loop,
+            http="httptools",
+            log_level="info"
+        )
     except KeyboardInterrupt:
         print("\n👋 Server stopped by user")
     except Exception as e:
@@ -39,7 +39,7 @@ async def test_nasa_api():
     try:
         ndvi_data = await nasa_client.fetch_modis_ndvi("nepal_himalayas", 2020)
         if ndvi_data:
-            print(f"✅ Successfully fetched NDVI data: {len(ndvi_data.get('data', []))} data points")
+            print(f"✅ Successfully fetched NDVI data: {len(ndvi_data['data']['value'])} data points")
             print(f"Source: {ndvi_data.get('source', 'Unknown')}")
         else:
             print("⚠️ No NDVI data returned, will use simulation")
@@ -7,7 +7,6 @@ Gets NASA API token and starts the application
 import os
 import sys
 import subprocess
-import time
 
 def get_nasa_token():
     """Get NASA API token from user"""
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Earth Observation Visualizer - Script Helpers
+Tool probing and readiness polling shared by the setup and start scripts
+"""
+
+import functools
+import shutil
+import subprocess
+import time
+
+@functools.lru_cache(maxsize=None)
+def tool_version(exe):
+    """Version string reported by `exe --version`, or None if it isn't installed
+
+    Cached, so each tool is probed at most once per run
+    """
+    path = shutil.which(exe)
+    if path is None:
+        return None
+    try:
+        result = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or result.stderr.strip()
+
+_session = None
+
+def http_session():
+    """Shared requests session, so every probe reuses one connection pool
+
+    Created on first use, so runs that never probe a server skip importing requests
+    """
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+    return _session
+
+def wait_ready(url, timeout=30, initial=0.05, process=None):
+    """Poll `url` until it answers, backing off from `initial` up to 0.5s
+
+    Returns the response, or None if nothing answered within `timeout`
+    seconds or `process` exited first
+    """
+    import requests
+
+    session = http_session()
+    deadline = time.monotonic() + timeout
+    delay = initial
+    while True:
+        try:
+            return session.get(url, timeout=1)
+        except requests.RequestException:
+            pass
+        if process is not None and process.poll() is not None:
+            return None
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
@@ -8,75 +8,137 @@ import os
 import sys
 import subprocess
 import shutil
+import threading
 from pathlib import Path
 
-def run_command(command, cwd=None, shell=True):
-    """Run a command and return the result"""
+from script_utils import tool_version, wait_ready
+from setup_env import create_directories
+
+def _resolve_argv(argv):
+    """argv with the program resolved on PATH, so it runs without a shell
+    
+    Without a shell, Windows needs the full path to wrappers like npm.cmd
+    """
+    return [shutil.which(argv[0]) or argv[0], *argv[1:]]
+
+def start_command(argv, cwd=None, label=None):
+    """Start a command in the background, echoing its output as it arrives
+    
+    Returns (process, drain_thread), or None if the command couldn't start
+    """
+    command = " ".join(argv)
     try:
-        result = subprocess.run(command, shell=shell, cwd=cwd, capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"❌ Error running command: {command}")
-            print(f"Error: {result.stderr}")
-            return False
-        print(f"✅ Success: {command}")
-        return True
+        process = subprocess.Popen(
+            _resolve_argv(argv), cwd=cwd,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+        )
     except Exception as e:
         print(f"❌ Exception running command: {command}")
         print(f"Error: {e}")
+        return None
+    
+    # One drain thread per process echoes output line by line as it arrives,
+    # so memory stays flat on long installs, concurrent commands' pipes
+    # never fill up, and each line is tagged with its command
+    prefix = f"[{label or command}] "
+    
+    def drain():
+        for line in process.stdout:
+            print(prefix + line, end="")
+    
+    thread = threading.Thread(target=drain, daemon=True)
+    thread.start()
+    return process, thread
+
+def wait_command(argv, started):
+    """Wait for a command from start_command and report how it finished"""
+    command = " ".join(argv)
+    if started is None:
         return False
+    process, thread = started
+    returncode = process.wait()
+    thread.join()
+    if returncode != 0:
+        print(f"❌ Error running command: {command} (exit code {returncode})")
+        return False
+    print(f"✅ Success: {command}")
+    return True
 
-def setup_directories():
-    """Create necessary directories"""
-    directories = [
-        "backend/logs",
-        "backend/uploads", 
-        "backend/reports",
-        "backend/cache",
-        "backend/static"
-    ]
-    
-    for directory in directories:
-        Path(directory).mkdir(parents=True, exist_ok=True)
-        print(f"✅ Created directory: {directory}")
+# Commands run as argv lists with no shell in between
+BACKEND_INSTALL_COMMAND = (sys.executable, "-m", "pip", "install", "-r", "backend/requirements.txt")
+FRONTEND_INSTALL_COMMAND = ("npm", "install")
 
 def install_backend_dependencies():
-    """Install Python backend dependencies"""
+    """Start installing Python backend dependencies in the background"""
     print("🐍 Installing Python backend dependencies...")
     
     # Check if Python is available
-    if not run_command("python --version"):
+    if tool_version("python") is None:
         print("❌ Python not found. Please install Python 3.11+")
-        return False
+        return None
     
     # Install dependencies
-    if not run_command("pip install -r backend/requirements.txt"):
-        print("❌ Failed to install backend dependencies")
-        return False
-    
-    print("✅ Backend dependencies installed successfully")
-    return True
+    return start_command(BACKEND_INSTALL_COMMAND, label="pip")
 
 def install_frontend_dependencies():
-    """Install Node.js frontend dependencies"""
+    """Start installing Node.js frontend dependencies in the background"""
     print("📦 Installing Node.js frontend dependencies...")
     
     # Check if Node.js is available
-    if not run_command("node --version"):
+    if tool_version("node") is None:
         print("❌ Node.js not found. Please install Node.js 18+")
-        return False
+        return None
     
     # Check if npm is available
-    if not run_command("npm --version"):
+    if tool_version("npm") is None:
         print("❌ npm not found. Please install npm")
-        return False
+        return None
     
     # Install dependencies
-    if not run_command("npm install"):
+    return start_command(FRONTEND_INSTALL_COMMAND, label="npm")
+
+def install_dependencies():
+    """Install backend and frontend dependencies concurrently
+    
+    pip writes to the Python environment and npm to node_modules/, so the
+    two network-bound installs can't interfere and overlap safely
+    """
+    backend = install_backend_dependencies()
+    frontend = install_frontend_dependencies()
+    
+    # Wait on both even if one fails, so neither is left running
+    backend_ok = wait_command(BACKEND_INSTALL_COMMAND, backend)
+    frontend_ok = wait_command(FRONTEND_INSTALL_COMMAND, frontend)
+    
+    if backend_ok:
+        print("✅ Backend dependencies installed successfully")
+    else:
+        print("❌ Failed to install backend dependencies")
+    if frontend_ok:
+        print("✅ Frontend dependencies installed successfully")
+    else:
         print("❌ Failed to install frontend dependencies")
-        return False
     
-    print("✅ Frontend dependencies installed successfully")
-    return True
+    return backend_ok and frontend_ok
+
+def set_env_values(path, values):
+    """Set KEY=value entries in an env file in one pass over its lines
+    
+    Existing keys are rewritten in place, keys the file lacks are appended,
+    and everything else (comments, other settings) is kept as is
+    """
+    pending = dict(values)
+    lines = []
+    with open(path, 'r') as f:
+        for line in f.read().splitlines():
+            key = line.split("=", 1)[0].strip()
+            if "=" in line and key in pending:
+                line = f"{key}={pending.pop(key)}"
+            lines.append(line)
+    lines.extend(f"{key}={value}" for key, value in pending.items())
+    
+    with open(path, 'w') as f:
+        f.write("\n".join(lines) + "\n")
 
 def configure_nasa_api(nasa_token):
     """Configure NASA API token in environment files"""
@@ -85,30 +147,15 @@ def configure_nasa_api(nasa_token):
     # Update backend environment
     backend_env_path = "backend/env.production"
     if os.path.exists(backend_env_path):
-        with open(backend_env_path, 'r') as f:
-            content = f.read()
-        
-        # Replace NASA API key
-        content = content.replace("your_nasa_api_key_here", nasa_token)
-        content = content.replace("USE_MOCK_DATA=false", "USE_MOCK_DATA=false")
-        
-        with open(backend_env_path, 'w') as f:
-            f.write(content)
-        
+        # Set the NASA API key and use real data
+        set_env_values(backend_env_path, {"NASA_API_KEY": nasa_token, "USE_MOCK_DATA": "false"})
         print("✅ NASA API token configured in backend")
     
     # Update frontend environment
     frontend_env_path = "frontend.env.local"
     if os.path.exists(frontend_env_path):
-        with open(frontend_env_path, 'r') as f:
-            content = f.read()
-        
         # Update API configuration
-        content = content.replace("VITE_MOCK_DATA_ENABLED=false", "VITE_MOCK_DATA_ENABLED=false")
-        
-        with open(frontend_env_path, 'w') as f:
-            f.write(content)
-        
+        set_env_values(frontend_env_path, {"VITE_MOCK_DATA_ENABLED": "false"})
         print("✅ Frontend environment configured")
     
     return True
@@ -158,14 +205,13 @@ def test_backend():
         stderr=subprocess.PIPE
     )
     
-    # Wait a moment for server to start
-    import time
-    time.sleep(5)
-    
-    # Test API endpoint
+    # Test API endpoint as soon as the server answers
     try:
-        import requests
-        response = requests.get("http://localhost:8000/health", timeout=10)
+        response = wait_ready("http://localhost:8000/health", process=backend_process)
+        if response is None:
+            print("❌ Backend API test failed: server did not respond")
+            backend_process.terminate()
+            return False
         if response.status_code == 200:
             print("✅ Backend API server is running successfully")
             backend_process.terminate()
@@ -194,9 +240,8 @@ def main():
     
     # Setup steps
     steps = [
-        ("Creating directories", setup_directories),
-        ("Installing backend dependencies", install_backend_dependencies),
-        ("Installing frontend dependencies", install_frontend_dependencies),
+        ("Creating directories", create_directories),
+        ("Installing backend and frontend dependencies", install_dependencies),
         ("Configuring NASA API", lambda: configure_nasa_api(nasa_token)),
         ("Creating startup scripts", create_startup_scripts),
     ]
@@ -7,6 +7,22 @@ Creates .env files with proper NASA API configuration
 import os
 from pathlib import Path
 
+def _write_if_changed(path, content):
+    """Write `content` to `path` unless it already holds exactly that
+    
+    Leaving an identical file untouched keeps its mtime, so watchers such
+    as uvicorn --reload don't restart for a no-op rerun. Returns whether
+    the file was written
+    """
+    data = content.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
+
 def create_backend_env():
     """Create backend .env file"""
     backend_env_content = """# Earth Observation Visualizer - Backend Environment Configuration
@@ -71,16 +87,6 @@ MOCK_DATA_REGION=nepal_himalayas
 SIMULATE_API_DELAY=true
 API_DELAY_MS=500
 
-# Environmental Data Configuration
-DATA_YEAR_MIN=2000
-DATA_YEAR_MAX=2025
-DEFAULT_REGION=nepal_himalayas
-
-# Processing Settings
-MAX_CONCURRENT_REQUESTS=10
-TIMEOUT_SECONDS=30
-RETRY_ATTEMPTS=3
-
 # File Storage
 UPLOAD_DIR=./uploads
 REPORT_OUTPUT_DIR=./reports
@@ -93,8 +99,10 @@ MAP_API_RATE_LIMIT=50000
 """
     
     backend_env_path = Path("backend/.env")
-    backend_env_path.write_text(backend_env_content)
-    print("✅ Created backend/.env file")
+    if _write_if_changed(backend_env_path, backend_env_content):
+        print("✅ Created backend/.env file")
+    else:
+        print("✅ backend/.env already up to date")
 
 def create_frontend_env():
     """Create frontend .env.local file"""
@@ -117,8 +125,10 @@ VITE_CACHE_TTL=3600000
 """
     
     frontend_env_path = Path(".env.local")
-    frontend_env_path.write_text(frontend_env_content)
-    print("✅ Created .env.local file")
+    if _write_if_changed(frontend_env_path, frontend_env_content):
+        print("✅ Created .env.local file")
+    else:
+        print("✅ .env.local already up to date")
 
 def create_directories():
     """Create necessary directories"""
@@ -130,9 +140,23 @@ def create_directories():
         "backend/static"
     ]
     
+    # One listing of backend/ says which already exist, so a rerun only
+    # touches the filesystem for the ones that are missing
+    try:
+        existing = {entry.name for entry in os.scandir("backend") if entry.is_dir()}
+    except FileNotFoundError:
+        existing = set()
+    
+    created = []
     for directory in directories:
+        if directory.split("/", 1)[1] in existing:
+            continue
         Path(directory).mkdir(parents=True, exist_ok=True)
-        print(f"✅ Created directory: {directory}")
+        created.append(f"✅ Created directory: {directory}")
+    
+    # Report them in one write rather than a flush per directory
+    if created:
+        print("\n".join(created), flush=True)
 
 def main():
     """Main setup function"""
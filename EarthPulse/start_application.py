@@ -10,12 +10,68 @@ import subprocess
 import time
 import signal
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from script_utils import tool_version, wait_ready
+
+# (executable, display name, install hint) for each required tool
+PREREQUISITES = (
+    ("python", "Python", "Python 3.11+"),
+    ("node", "Node.js", "Node.js 18+"),
+    ("npm", "npm", "npm"),
+)
+
+# Records the tool versions from the last successful prerequisite check;
+# while it's fresh, restarts skip spawning the version probes
+PREREQ_STAMP = Path.home() / ".cache" / "earthpulse" / "prereq.stamp"
+PREREQ_STAMP_MAX_AGE = 86400  # seconds
+
+def _prereqs_recently_checked():
+    """Whether the prerequisites passed a check within PREREQ_STAMP_MAX_AGE"""
+    try:
+        return time.time() - PREREQ_STAMP.stat().st_mtime < PREREQ_STAMP_MAX_AGE
+    except OSError:
+        return False
+
+def _record_prereqs(versions):
+    """Write the prerequisite stamp; failing to is harmless, the next run just re-checks"""
+    try:
+        PREREQ_STAMP.parent.mkdir(parents=True, exist_ok=True)
+        PREREQ_STAMP.write_text("".join(f"{exe}: {version}\n" for exe, version in versions))
+    except OSError:
+        pass
+
+def _npm_deps_fresh():
+    """Whether node_modules was installed from the current package-lock.json
+    
+    npm 7+ records each install in node_modules/.package-lock.json, so it
+    being at least as new as the lockfile means there's nothing to install
+    """
+    try:
+        installed = Path("node_modules/.package-lock.json").stat().st_mtime
+    except FileNotFoundError:
+        return False
+    try:
+        return installed >= Path("package-lock.json").stat().st_mtime
+    except FileNotFoundError:
+        return True
+
+# Server output goes to these files; a pipe nobody reads would eventually
+# fill up and block the server in write()
+BACKEND_LOG = Path("backend/logs/uvicorn.out")
+FRONTEND_LOG = Path("logs/frontend.out")
+
+def _open_log(path):
+    """Open a server log for appending, creating its directory if needed"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return open(path, "ab", buffering=0)
+
 class ApplicationManager:
     def __init__(self):
         self.backend_process = None
         self.frontend_process = None
+        self.log_files = []
         self.running = True
         
     def signal_handler(self, signum, frame):
@@ -25,8 +81,8 @@ class ApplicationManager:
         self.stop_servers()
         sys.exit(0)
     
-    def start_backend(self):
-        """Start the FastAPI backend server"""
+    def _spawn_backend(self):
+        """Launch the FastAPI backend server without waiting for it"""
         print("🚀 Starting Earth Observation Visualizer Backend...")
         
         try:
@@ -41,6 +97,8 @@ class ApplicationManager:
             env["PYTHONPATH"] = str(backend_dir.absolute())
             
             # Start uvicorn server
+            backend_log = _open_log(BACKEND_LOG)
+            self.log_files.append(backend_log)
             self.backend_process = subprocess.Popen(
                 [
                     "python", "-m", "uvicorn", 
@@ -51,42 +109,43 @@ class ApplicationManager:
                 ],
                 cwd=backend_dir,
                 env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True
+                stdout=backend_log,
+                stderr=subprocess.STDOUT
             )
-            
-            # Wait for backend to start
-            print("⏳ Waiting for backend to start...")
-            time.sleep(5)
-            
-            # Test backend health
-            try:
-                import requests
-                response = requests.get("http://localhost:8000/health", timeout=10)
-                if response.status_code == 200:
-                    print("✅ Backend API server started successfully")
-                    print("📡 Backend API: http://localhost:8000")
-                    print("📚 API Documentation: http://localhost:8000/api/docs")
-                    return True
-                else:
-                    print(f"❌ Backend health check failed: {response.status_code}")
-                    return False
-            except Exception as e:
-                print(f"❌ Backend health check failed: {e}")
-                return False
+            print(f"📝 Backend log: {BACKEND_LOG}")
+            return True
                 
         except Exception as e:
             print(f"❌ Failed to start backend: {e}")
             return False
     
-    def start_frontend(self):
-        """Start the React frontend server"""
+    def _await_backend(self):
+        """Wait for the backend to pass its health check"""
+        print("⏳ Waiting for backend to start...")
+        try:
+            response = wait_ready("http://localhost:8000/health", process=self.backend_process)
+            if response is None:
+                print("❌ Backend health check failed: server did not respond")
+                return False
+            if response.status_code == 200:
+                print("✅ Backend API server started successfully")
+                print("📡 Backend API: http://localhost:8000")
+                print("📚 API Documentation: http://localhost:8000/api/docs")
+                return True
+            else:
+                print(f"❌ Backend health check failed: {response.status_code}")
+                return False
+        except Exception as e:
+            print(f"❌ Backend health check failed: {e}")
+            return False
+    
+    def _spawn_frontend(self):
+        """Launch the React frontend server without waiting for it"""
         print("🌐 Starting Earth Observation Visualizer Frontend...")
         
         try:
-            # Check if node_modules exists
-            if not Path("node_modules").exists():
+            # Install only when node_modules is missing or older than the lockfile
+            if not _npm_deps_fresh():
                 print("📦 Installing frontend dependencies...")
                 install_result = subprocess.run(
                     ["npm", "install"],
@@ -99,25 +158,33 @@ class ApplicationManager:
                 print("✅ Frontend dependencies installed")
             
             # Start npm dev server
+            frontend_log = _open_log(FRONTEND_LOG)
+            self.log_files.append(frontend_log)
             self.frontend_process = subprocess.Popen(
                 ["npm", "run", "dev"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True
+                stdout=frontend_log,
+                stderr=subprocess.STDOUT
             )
-            
-            # Wait for frontend to start
-            print("⏳ Waiting for frontend to start...")
-            time.sleep(8)
-            
-            print("✅ Frontend server started successfully")
-            print("🌐 Frontend Application: http://localhost:3000")
+            print(f"📝 Frontend log: {FRONTEND_LOG}")
             return True
             
         except Exception as e:
             print(f"❌ Failed to start frontend: {e}")
             return False
     
+    def _await_frontend(self):
+        """Wait for the frontend dev server to answer"""
+        print("⏳ Waiting for frontend to start...")
+        try:
+            if wait_ready("http://localhost:3000", process=self.frontend_process) is None:
+                print("⚠️  Frontend not answering yet; it may still be compiling")
+            else:
+                print("✅ Frontend server started successfully")
+        except Exception as e:
+            print(f"⚠️  Frontend check failed: {e}")
+        print("🌐 Frontend Application: http://localhost:3000")
+        return True
+    
     def stop_servers(self):
         """Stop both backend and frontend servers"""
         if self.backend_process:
@@ -135,25 +202,35 @@ class ApplicationManager:
                 self.frontend_process.wait(timeout=5)
             except subprocess.TimeoutExpired:
                 self.frontend_process.kill()
+        
+        for log_file in self.log_files:
+            log_file.close()
+        self.log_files.clear()
     
     def monitor_servers(self):
-        """Monitor server processes"""
-        while self.running:
-            try:
-                # Check backend
-                if self.backend_process and self.backend_process.poll() is not None:
-                    print("❌ Backend server stopped unexpectedly")
-                    break
-                
-                # Check frontend
-                if self.frontend_process and self.frontend_process.poll() is not None:
-                    print("❌ Frontend server stopped unexpectedly")
-                    break
-                
-                time.sleep(1)
-                
-            except KeyboardInterrupt:
-                break
+        """Monitor server processes, returning once either one exits"""
+        exited = threading.Event()
+        
+        # One thread per server blocks in wait() until its process ends, so
+        # an exit is seen immediately without waking up to poll
+        def watch(process, name):
+            process.wait()
+            if self.running:
+                print(f"❌ {name} server stopped unexpectedly")
+            exited.set()
+        
+        for process, name in ((self.backend_process, "Backend"), (self.frontend_process, "Frontend")):
+            if process:
+                threading.Thread(target=watch, args=(process, name), daemon=True).start()
+        
+        # Signals interrupt an untimed wait on POSIX; on Windows Ctrl+C is
+        # only delivered between waits, so wake up once a second there
+        timeout = None if os.name == "posix" else 1
+        try:
+            while self.running and not exited.wait(timeout):
+                pass
+        except KeyboardInterrupt:
+            pass
     
     def run(self):
         """Run the complete application"""
@@ -167,52 +244,43 @@ class ApplicationManager:
         # Check prerequisites
         print("🔍 Checking prerequisites...")
         
-        # Check Python
-        try:
-            result = subprocess.run(["python", "--version"], capture_output=True, text=True)
-            if result.returncode != 0:
-                print("❌ Python not found. Please install Python 3.11+")
-                return False
-            print(f"✅ Python: {result.stdout.strip()}")
-        except Exception:
-            print("❌ Python not found. Please install Python 3.11+")
-            return False
-        
-        # Check Node.js
-        try:
-            result = subprocess.run(["node", "--version"], capture_output=True, text=True)
-            if result.returncode != 0:
-                print("❌ Node.js not found. Please install Node.js 18+")
-                return False
-            print(f"✅ Node.js: {result.stdout.strip()}")
-        except Exception:
-            print("❌ Node.js not found. Please install Node.js 18+")
-            return False
-        
-        # Check npm
-        try:
-            result = subprocess.run(["npm", "--version"], capture_output=True, text=True)
-            if result.returncode != 0:
-                print("❌ npm not found. Please install npm")
-                return False
-            print(f"✅ npm: {result.stdout.strip()}")
-        except Exception:
-            print("❌ npm not found. Please install npm")
-            return False
+        if _prereqs_recently_checked():
+            print(f"✅ Prerequisites verified within the last day ({PREREQ_STAMP})")
+        else:
+            versions = []
+            for exe, name, hint in PREREQUISITES:
+                version = tool_version(exe)
+                if version is None:
+                    print(f"❌ {name} not found. Please install {hint}")
+                    return False
+                print(f"✅ {name}: {version}")
+                versions.append((exe, version))
+            _record_prereqs(versions)
         
         print("\n🚀 Starting servers...")
         
-        # Start backend
-        if not self.start_backend():
+        # Launch both servers first (the backend boots while any npm install
+        # runs), then wait on their readiness probes side by side
+        if not self._spawn_backend():
             print("❌ Failed to start backend server")
             return False
         
-        # Start frontend
-        if not self.start_frontend():
+        if not self._spawn_frontend():
             print("❌ Failed to start frontend server")
             self.stop_servers()
             return False
         
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            backend_ready = executor.submit(self._await_backend)
+            frontend_ready = executor.submit(self._await_frontend)
+            
+            if not backend_ready.result():
+                print("❌ Failed to start backend server")
+                frontend_ready.result()
+                self.stop_servers()
+                return False
+            frontend_ready.result()
+        
         print("\n🎉 Application started successfully!")
         print("\n📋 Access Points:")
         print("🌐 Frontend: http://localhost:3000")
@@ -6,21 +6,44 @@ Tests the complete backend-frontend integration
 
 import asyncio
 import httpx
-import json
 import sys
 from datetime import datetime
 
+# Upper bound on requests in flight at once during the performance test
+MAX_CONCURRENT_REQUESTS = 16
+
 class IntegrationTester:
+    # (path under /api/v1, indicator) for each environmental data endpoint
+    _ENV_ENDPOINTS = (
+        ("/environmental/ndvi/2020?region=nepal_himalayas", "ndvi"),
+        ("/environmental/glacier/2020?region=nepal_himalayas", "glacier"),
+        ("/environmental/urban/2020?region=nepal_himalayas", "urban"),
+        ("/environmental/temperature/2020?region=nepal_himalayas", "temperature")
+    )
+    
     def __init__(self, base_url="http://localhost:8000"):
         self.base_url = base_url
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # One pooled client for every test; over HTTP/2 concurrent requests
+        # share a single multiplexed connection instead of opening new ones,
+        # and connection failures are retried so a transient socket error
+        # doesn't fail a whole test. With an explicit transport, HTTP/2 and
+        # the pool limits are configured on the transport itself
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=30.0,
+            transport=httpx.AsyncHTTPTransport(
+                retries=2,
+                http2=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+            )
+        )
         
     async def test_backend_health(self):
         """Test backend health check"""
         print("🔍 Testing Backend Health...")
         
         try:
-            response = await self.client.get(f"{self.base_url}/health")
+            response = await self.client.get("/health")
             if response.status_code == 200:
                 print("✅ Backend is healthy")
                 return True
@@ -36,7 +59,7 @@ class IntegrationTester:
         print("🔍 Testing API Information...")
         
         try:
-            response = await self.client.get(f"{self.base_url}/api/v1/info")
+            response = await self.client.get("/api/v1/info")
             if response.status_code == 200:
                 data = response.json()
                 print("✅ API info retrieved successfully")
@@ -55,37 +78,33 @@ class IntegrationTester:
         """Test environmental data endpoints"""
         print("🔍 Testing Environmental Data Endpoints...")
         
-        endpoints = [
-            "/environmental/ndvi/2020?region=nepal_himalayas",
-            "/environmental/glacier/2020?region=nepal_himalayas", 
-            "/environmental/urban/2020?region=nepal_himalayas",
-            "/environmental/temperature/2020?region=nepal_himalayas"
-        ]
-        
         success_count = 0
         
-        for endpoint in endpoints:
-            try:
-                response = await self.client.get(f"{self.base_url}/api/v1{endpoint}")
-                if response.status_code == 200:
-                    data = response.json()
-                    indicator = endpoint.split('/')[1]
-                    print(f"✅ {indicator.upper()} data retrieved")
-                    success_count += 1
-                else:
-                    print(f"❌ {endpoint} failed: {response.status_code}")
-            except Exception as e:
-                print(f"❌ {endpoint} error: {e}")
+        # The endpoints are independent, so request them all at once
+        responses = await asyncio.gather(
+            *(self.client.get(f"/api/v1{endpoint}") for endpoint, _ in self._ENV_ENDPOINTS),
+            return_exceptions=True
+        )
         
-        print(f"Environmental endpoints: {success_count}/4 successful")
-        return success_count == 4
+        for (endpoint, indicator), response in zip(self._ENV_ENDPOINTS, responses):
+            if isinstance(response, Exception):
+                print(f"❌ {endpoint} error: {response}")
+            elif response.status_code == 200:
+                data = response.json()
+                print(f"✅ {indicator.upper()} data retrieved")
+                success_count += 1
+            else:
+                print(f"❌ {endpoint} failed: {response.status_code}")
+        
+        print(f"Environmental endpoints: {success_count}/{len(self._ENV_ENDPOINTS)} successful")
+        return success_count == len(self._ENV_ENDPOINTS)
     
     async def test_map_services(self):
         """Test map services endpoints"""
         print("🔍 Testing Map Services...")
         
         try:
-            response = await self.client.get(f"{self.base_url}/api/v1/maps/regions")
+            response = await self.client.get("/api/v1/maps/regions")
             if response.status_code == 200:
                 data = response.json()
                 regions = data.get('regions', [])
@@ -114,10 +133,11 @@ class IntegrationTester:
         
         try:
             response = await self.client.post(
-                f"{self.base_url}/api/v1/reports/generate",
+                "/api/v1/reports/generate",
                 json=report_request
             )
-            if response.status_code == 200:
+            # 202 means the report was queued and is being built in the background
+            if response.status_code in (200, 202):
                 data = response.json()
                 print("✅ Report generation successful")
                 print(f"   • Report ID: {data.get('report_id')}")
@@ -134,24 +154,30 @@ class IntegrationTester:
         """Test API performance"""
         print("🔍 Testing API Performance...")
         
-        start_time = datetime.now()
+        years = range(2020, 2025)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
         
-        # Concurrent requests
-        tasks = []
-        for year in range(2020, 2025):
-            tasks.append(self.client.get(f"{self.base_url}/api/v1/environmental/summary?year={year}&region=nepal_himalayas"))
+        async def fetch(year):
+            async with semaphore:
+                return await self.client.get(
+                    "/api/v1/environmental/summary",
+                    params={"year": year, "region": "nepal_himalayas"}
+                )
+        
+        start_time = datetime.now()
         
         try:
-            responses = await asyncio.gather(*tasks)
+            # Concurrent requests, bounded so a wider year range can't exhaust sockets
+            responses = await asyncio.gather(*(fetch(year) for year in years))
             end_time = datetime.now()
             
             successful = sum(1 for r in responses if r.status_code == 200)
             duration = (end_time - start_time).total_seconds()
             
             print(f"✅ Performance test completed")
-            print(f"   • Successful requests: {successful}/5")
+            print(f"   • Successful requests: {successful}/{len(years)}")
             print(f"   • Duration: {duration:.2f}s")
-            print(f"   • Average response time: {duration/5:.2f}s")
+            print(f"   • Average response time: {duration/len(years):.2f}s")
             
             return successful >= 4
         except Exception as e:
@@ -232,4 +258,11 @@ async def main():
         await tester.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop (installed with uvicorn[standard]) is a faster event loop for
+    # the concurrent request tests; fall back to asyncio's when it's absent
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())